@@ -0,0 +1,105 @@
+"""Background batching writer for audit-trail activity logs"""
+
+import atexit
+import logging
+import queue
+import threading
+from typing import Any, Dict, List
+
+from extensions import db
+from models import ActivityLog
+
+logger = logging.getLogger(__name__)
+
+BATCH_SIZE = 100  # Max rows per INSERT batch
+FLUSH_INTERVAL = 1.0  # Seconds to wait for more rows before writing
+
+
+class ActivityLogWriter:
+    """Queues ActivityLog rows and writes them in batches off the request path.
+
+    Rows are plain dicts of ActivityLog column values. On a long-running
+    server, start() runs a daemon thread that drains the queue and writes up
+    to BATCH_SIZE rows per bulk insert; anything still queued at interpreter
+    exit is flushed by an atexit hook. Serverless instances are frozen between
+    requests and never run atexit, so they use flush_after_requests() instead.
+    """
+
+    def __init__(self, app, batch_size: int = BATCH_SIZE, flush_interval: float = FLUSH_INTERVAL):
+        self.app = app
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self._queue = queue.Queue()
+        self._write_lock = threading.Lock()
+        self._thread = None
+
+    def start(self):
+        """Start the writer thread (idempotent)"""
+        if self._thread is not None:
+            return
+        self._thread = threading.Thread(target=self._run, name="activity-log-writer", daemon=True)
+        self._thread.start()
+        atexit.register(self.flush)
+
+    def flush_after_requests(self):
+        """Write queued rows as each request ends, without a writer thread"""
+        @self.app.teardown_request
+        def flush_activity_logs(exception):
+            if not self._queue.empty():
+                self.flush()
+
+    def enqueue(self, row: Dict[str, Any]):
+        """Queue one activity row; never blocks the caller"""
+        self._queue.put_nowait(row)
+
+    def flush(self):
+        """Synchronously write everything currently queued"""
+        with self.app.app_context():
+            while True:
+                batch = self._drain()
+                if not batch:
+                    return
+                self._write(batch)
+
+    def _drain(self, first=None) -> List[Dict[str, Any]]:
+        batch = [] if first is None else [first]
+        while len(batch) < self.batch_size:
+            try:
+                batch.append(self._queue.get_nowait())
+            except queue.Empty:
+                break
+        return batch
+
+    def _run(self):
+        # One app context for the thread's lifetime rather than one per batch
+        with self.app.app_context():
+            while True:
+                try:
+                    first = self._queue.get(timeout=self.flush_interval)
+                except queue.Empty:
+                    continue
+                self._write(self._drain(first))
+
+    def _write(self, rows: List[Dict[str, Any]]):
+        """Bulk-insert one batch; the caller must have an app context pushed"""
+        with self._write_lock:
+            if self._insert(rows):
+                return
+            # A batch mixes rows from unrelated requests; retry one at a time
+            # so a single bad row (e.g. a deleted user) only loses itself
+            for row in rows:
+                self._insert([row])
+
+    def _insert(self, rows: List[Dict[str, Any]]) -> bool:
+        try:
+            db.session.bulk_insert_mappings(ActivityLog, rows)
+            db.session.commit()
+            return True
+        except Exception as e:
+            # Don't let activity logging break the main functionality
+            logger.warning(f"Failed to write {len(rows)} activity log rows: {e}")
+            try:
+                db.session.rollback()
+            except Exception:
+                pass
+            return False
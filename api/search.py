@@ -26,6 +26,10 @@ def search_api():
             "per_page": per_page
         })
     
+    # One substring pattern for every text column; ILIKE '%term%' is served by
+    # the pg_trgm GIN indexes on PostgreSQL
+    pattern = f"%{query}%"
+
     # Parse tags into list
     tag_list = [tag.strip() for tag in tags.split(",") if tag.strip()] if tags else []
     
@@ -43,9 +47,9 @@ def search_api():
         # Apply text search
         updates_query = updates_query.filter(
             or_(
-                Update.message.ilike(f"%{query}%"),
-                Update.name.ilike(f"%{query}%"),
-                Update.process.ilike(f"%{query}%")
+                Update.message.ilike(pattern),
+                Update.name.ilike(pattern),
+                Update.process.ilike(pattern)
             )
         )
         
@@ -83,9 +87,9 @@ def search_api():
         # Apply text search
         sops_query = sops_query.filter(
             or_(
-                SOPSummary.title.ilike(f"%{query}%"),
-                SOPSummary.summary_text.ilike(f"%{query}%"),
-                SOPSummary.department.ilike(f"%{query}%")
+                SOPSummary.title.ilike(pattern),
+                SOPSummary.summary_text.ilike(pattern),
+                SOPSummary.department.ilike(pattern)
             )
         )
         
@@ -123,11 +127,11 @@ def search_api():
         # Apply text search
         lessons_query = lessons_query.filter(
             or_(
-                LessonLearned.title.ilike(f"%{query}%"),
-                LessonLearned.content.ilike(f"%{query}%"),
-                LessonLearned.summary.ilike(f"%{query}%"),
-                LessonLearned.author.ilike(f"%{query}%"),
-                LessonLearned.department.ilike(f"%{query}%")
+                LessonLearned.title.ilike(pattern),
+                LessonLearned.content.ilike(pattern),
+                LessonLearned.summary.ilike(pattern),
+                LessonLearned.author.ilike(pattern),
+                LessonLearned.department.ilike(pattern)
             )
         )
         
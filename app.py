@@ -27,65 +27,106 @@ import time
 import uuid
 import pytz
 import re
+import csv
+import html
+import gzip
+import json
+import zipfile
+import traceback
 import logging
-from datetime import datetime, timedelta
+import tempfile
+import psutil
+from datetime import datetime
 from urllib.parse import urlparse
 
 from dotenv import load_dotenv
-from flask import Flask, current_app, render_template, request, redirect, url_for, flash, session, jsonify, send_file, Response
+from jinja2 import FileSystemBytecodeCache
+from flask import Flask, current_app, render_template, stream_template, get_flashed_messages, request, redirect, url_for, flash, session, jsonify, send_file, Response, after_this_request
 from flask_sqlalchemy import SQLAlchemy
-from sqlalchemy import text, func, or_
+from sqlalchemy import text, func, or_, and_, select, delete, exists, literal, bindparam, cast, case, null, union_all, tuple_
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.orm import load_only
+from sqlalchemy.pool import NullPool
 from werkzeug.security import generate_password_hash, check_password_hash
-from functools import wraps
+from functools import wraps, lru_cache
 from flask_migrate import Migrate
 from read_logs import bp as read_logs_bp
 from flask_login import LoginManager, login_required
-from models import User, Update, ReadLog, LessonReadLog, SOPSummary, LessonLearned, ActivityLog, ArchivedUpdate, ArchivedSOPSummary, ArchivedLessonLearned
+from models import DatabaseAgnosticArray, User, Update, ReadLog, LessonReadLog, SOPSummary, LessonLearned, ActivityLog, ArchivedUpdate, ArchivedSOPSummary, ArchivedLessonLearned
 from extensions import db
-from database import db_session
-from role_decorators import admin_required, editor_required, writer_required, delete_required, export_required, get_user_role_info
-from timezone_utils import UTC, IST, now_utc, to_utc, to_ist, format_ist, ensure_timezone, is_within_hours, get_hours_ago
-from io import BytesIO
+from database import db_session, ensure_database_ready, validate_connection_before_operation
+from role_decorators import admin_required, editor_required, writer_required, delete_required, export_required, get_user_role_info, get_current_user, get_user_by_id
+from timezone_utils import UTC, IST, now_utc, to_utc, to_ist, format_ist, ensure_timezone, get_hours_ago
+from io import BytesIO, TextIOWrapper
+from backup_system import DatabaseBackupSystem
+from xlsx_export import StreamingWorkbook
+from cache_utils import TTLCache
+from activity_queue import ActivityLogWriter
+from restore_jobs import RestoreJobRunner
 import sys
 from pathlib import Path
 
 # Performance monitoring
+def _response_status(result):
+    """Best-effort status code of a view return value"""
+    if isinstance(result, tuple):
+        if len(result) > 1 and isinstance(result[1], int):
+            return result[1]
+        result = result[0]
+    return getattr(result, 'status_code', 200)
+
+def _request_log_fields(duration, result=None, status=None):
+    """Structured fields attached to performance log records via ``extra``"""
+    return {
+        'duration_ms': int(duration * 1000),
+        'endpoint': request.endpoint,
+        'method': request.method,
+        'path': request.path,
+        'status': status if status is not None else _response_status(result),
+    }
+
 def performance_logger(f):
     """Decorator to log response times for performance monitoring"""
     @wraps(f)
     def decorated_function(*args, **kwargs):
-        start_time = time.time()
+        # Skip timing entirely when disabled or for CORS preflight requests
+        if request.method == 'OPTIONS' or not current_app.config.get('PERF_LOG_ENABLED', True):
+            return f(*args, **kwargs)
+
+        start_time = time.perf_counter()
         try:
             result = f(*args, **kwargs)
-            end_time = time.time()
-            duration = end_time - start_time
+
+            # Redirects (flash-and-redirect admin flows) are not worth logging
+            if 300 <= _response_status(result) < 400:
+                return result
+
+            duration = time.perf_counter() - start_time
 
             # Log very slow requests (>2 seconds) as warnings
             if duration > 2.0:
                 logger.warning(
-                    f"Very slow request - Duration: {duration:.2f}s - "
-                    f"endpoint={request.endpoint} "
-                    f"method={request.method} "
-                    f"path={request.path}"
+                    "Very slow request - Duration: %.2fs - endpoint=%s method=%s path=%s",
+                    duration, request.endpoint, request.method, request.path,
+                    extra=_request_log_fields(duration, result)
                 )
 
             # Only log errors for performance monitoring - reduced verbosity
             elif duration > 1.0:
                 logger.info(
-                    f"Slow request - Duration: {duration:.3f}s - "
-                    f"endpoint={request.endpoint} "
-                    f"method={request.method}"
+                    "Slow request - Duration: %.3fs - endpoint=%s method=%s",
+                    duration, request.endpoint, request.method,
+                    extra=_request_log_fields(duration, result)
                 )
 
             return result
         except Exception as e:
-            end_time = time.time()
-            duration = end_time - start_time
+            duration = time.perf_counter() - start_time
             logger.error(
-                f"Request failed - Duration: {duration:.2f}s - "
-                f"endpoint={request.endpoint} "
-                f"method={request.method} "
-                f"error={str(e)}"
+                "Request failed - Duration: %.2fs - endpoint=%s method=%s error=%s",
+                duration, request.endpoint, request.method, e,
+                extra=_request_log_fields(duration, status=500)
             )
             raise
     return decorated_function
@@ -112,10 +153,53 @@ login_manager.login_view = 'login'
 # Process start timestamp for basic metrics
 APP_START = time.time()
 
-# Enhanced in-memory cache for performance optimization
-_cache = {}
+# Pre-encoded JSON bodies for the global error handlers. A fresh Response is
+# still built per error because after_request hooks mutate response headers.
+_NOT_FOUND_BODY = b'{"error":"Not Found","message":"The requested resource was not found."}\n'
+_INTERNAL_ERROR_BODY = b'{"error":"Internal Server Error","message":"An unexpected error occurred. Please try again later."}\n'
+_UNEXPECTED_ERROR_BODY = b'{"error":"Unexpected Error","message":"An unexpected error occurred."}\n'
+
+# Archive model -> (source model, columns copied verbatim by archive_rows)
+ARCHIVE_COLUMNS = {
+    ArchivedUpdate: (Update, ['id', 'name', 'process', 'message', 'timestamp']),
+    ArchivedSOPSummary: (SOPSummary, ['id', 'title', 'summary_text', 'department', 'tags', 'created_at']),
+    ArchivedLessonLearned: (LessonLearned, ['id', 'title', 'content', 'summary', 'author', 'department', 'tags', 'created_at']),
+}
+
+# Matches a single HTML tag; used by the strip_html/truncate_html filters
+_HTML_TAG_RE = re.compile(r'<[^>]+>')
+
+# Allowed characters for a username (after spaces become underscores)
+_USERNAME_RE = re.compile(r'\A[A-Za-z0-9_]+\Z')
+
+# One tag between commas, without surrounding whitespace; used by parse_tags
+_TAG_RE = re.compile(r'[^,\s](?:[^,]*[^,\s])?')
+MAX_TAGS_LENGTH = 4096  # Longer tag fields are rejected by the add/edit forms
+
+# Headers added to every response by the after_request header hook
+_BASE_RESPONSE_HEADERS = {'X-Server-Version': 'LoopIn-v1.0'}
+_DEV_RESPONSE_HEADERS = {'X-Debug-Mode': 'true', 'X-Status': 'healthy'}
+
+# Development static asset headers keyed by file extension, used by
+# add_cache_control
+_DEV_STATIC_HEADERS_BY_EXT = {
+    ext: {
+        'Cache-Control': 'no-cache, no-store, must-revalidate',
+        'Pragma': 'no-cache',
+        'Expires': '0',
+    }
+    for ext in ('.js', '.css')
+}
+# How long browsers may cache static files in production (1 year)
+STATIC_MAX_AGE = 31536000
+# Backups and exports hold the whole database; never let anything cache them
+DOWNLOAD_CACHE_CONTROL = 'private, no-store'
+
+# Enhanced in-memory cache for performance optimization (thread-safe, bounded)
 CACHE_TIMEOUT = 600  # 10 minutes - increased for better performance
 MAX_CACHE_SIZE = 1000  # Prevent memory leaks
+_cache = TTLCache(maxsize=MAX_CACHE_SIZE, ttl=CACHE_TIMEOUT)
+_user_role_cache = TTLCache(maxsize=10000, ttl=CACHE_TIMEOUT)
 
 def get_cache_size():
     """Get current cache size"""
@@ -123,19 +207,40 @@ def get_cache_size():
 
 def cleanup_expired_cache():
     """Clean up expired cache entries"""
-    current_time = time.time()
-    expired_keys = [
-        key for key, (cached_time, _) in _cache.items()
-        if current_time - cached_time >= CACHE_TIMEOUT
-    ]
-    for key in expired_keys:
-        del _cache[key]
-
-    # If cache is still too large, remove oldest entries
-    if len(_cache) > MAX_CACHE_SIZE:
-        sorted_items = sorted(_cache.items(), key=lambda x: x[1][0])
-        for key, _ in sorted_items[:len(_cache) - MAX_CACHE_SIZE]:
-            del _cache[key]
+    _cache.expire()
+    _user_role_cache.expire()
+
+# Process handle and last RSS reading for /health, refreshed at most every 5s
+_process_handle = None
+_memory_reading = {"t": 0.0, "mb": 0.0}
+MEMORY_READING_TTL = 5  # seconds
+
+def get_process_memory_mb():
+    """Resident memory of this worker in MB, memoized for a few seconds"""
+    global _process_handle
+    now = time.monotonic()
+    if now - _memory_reading["t"] > MEMORY_READING_TTL:
+        # Re-create the handle if we are in a forked worker
+        if _process_handle is None or _process_handle.pid != os.getpid():
+            _process_handle = psutil.Process(os.getpid())
+        _memory_reading.update(t=now, mb=_process_handle.memory_info().rss / 1024 / 1024)
+    return _memory_reading["mb"]
+
+# Last database liveness result for /health, refreshed at most every 15s
+_db_health = {"t": 0.0, "ok": False, "error": None}
+DB_HEALTH_TTL = 15  # seconds
+
+def check_database_alive(force=False):
+    """Memoized SELECT 1 liveness check; returns (ok, error)"""
+    now = time.monotonic()
+    if force or _db_health["t"] == 0.0 or now - _db_health["t"] > DB_HEALTH_TTL:
+        try:
+            db.session.execute(text("SELECT 1"))
+            _db_health.update(t=now, ok=True, error=None)
+        except Exception as e:
+            db.session.rollback()
+            _db_health.update(t=now, ok=False, error=str(e))
+    return _db_health["ok"], _db_health["error"]
 
 def ensure_db_connection_clean():
     """Ensure database connection is clean and ready for use"""
@@ -156,27 +261,20 @@ def ensure_db_connection_clean():
             logger.error(f"Error during connection cleanup: {cleanup_e}")
         return False
 
+# Role flags for templates when nobody is logged in or the lookup fails
+DEFAULT_USER_ROLE = {'is_admin': False, 'is_editor': False, 'is_writer': False, 'is_deleter': False, 'is_exporter': False}
+
 def get_cached_user_role(user_id):
     """Get cached user role information with improved performance"""
-    cache_key = f"user_role_{user_id}"
-    current_time = time.time()
-
-    if cache_key in _cache:
-        cached_time, role_info = _cache[cache_key]
-        if current_time - cached_time < CACHE_TIMEOUT:
-            return role_info
-        else:
-            del _cache[cache_key]
-
-    # Clean up expired entries less frequently - only when cache is near capacity
-    if len(_cache) >= MAX_CACHE_SIZE:
-        cleanup_expired_cache()
+    role_info = _user_role_cache.get(user_id)
+    if role_info is not None:
+        return role_info
 
     try:
-        user = User.query.get(user_id)
+        user = db.session.get(User, user_id)
         if user:
             role_info = get_user_role_info(user)
-            _cache[cache_key] = (current_time, role_info)
+            _user_role_cache.set(user_id, role_info)
             return role_info
     except Exception as e:
         logger.warning(f"Error in get_cached_user_role: {e}")
@@ -186,35 +284,86 @@ def get_cached_user_role(user_id):
         except:
             pass
 
-    return {'is_admin': False, 'is_editor': False, 'is_writer': False, 'is_deleter': False, 'is_exporter': False}
+    return DEFAULT_USER_ROLE
+
+# Cached aggregates over the updates table, dropped on post/edit/delete/restore
+UPDATE_AUTHORS_CACHE_KEY = "updates_page_authors"
+UPDATE_PROCESSES_CACHE_KEY = "updates_page_processes"
+LATEST_UPDATE_TIME_CACHE_KEY = "latest_update_timestamp"
+UPDATES_THIS_WEEK_CACHE_KEY = "updates_weekly_count"
+UPDATE_AGGREGATE_CACHE_KEYS = (
+    UPDATE_AUTHORS_CACHE_KEY, UPDATE_PROCESSES_CACHE_KEY, LATEST_UPDATE_TIME_CACHE_KEY, UPDATES_THIS_WEEK_CACHE_KEY
+)
 
 def get_cached_update_count():
     """Cache total update count for performance"""
     cache_key = "total_update_count"
-    current_time = time.time()
-
-    if cache_key in _cache:
-        cached_time, count = _cache[cache_key]
-        if current_time - cached_time < 60:  # Cache for 1 minute
-            return count
-        else:
-            del _cache[cache_key]
+    count = _cache.get(cache_key)
+    if count is not None:
+        return count
 
     count = Update.query.count()
-    _cache[cache_key] = (current_time, count)
+    _cache.set(cache_key, count, ttl=60)  # Cache for 1 minute
+    return count
+
+def get_cached_update_authors():
+    """Distinct update authors for the /updates filter dropdown"""
+    authors = _cache.get(UPDATE_AUTHORS_CACHE_KEY)
+    if authors is None:
+        authors = [row[0] for row in db.session.query(Update.name).filter(Update.name.isnot(None)).distinct().all()]
+        _cache.set(UPDATE_AUTHORS_CACHE_KEY, authors, ttl=300)
+    return authors
+
+def get_cached_update_processes():
+    """Distinct update processes for the /updates filter dropdown"""
+    processes = _cache.get(UPDATE_PROCESSES_CACHE_KEY)
+    if processes is None:
+        processes = [row[0] for row in db.session.query(Update.process).filter(Update.process.isnot(None)).distinct().all()]
+        _cache.set(UPDATE_PROCESSES_CACHE_KEY, processes, ttl=300)
+    return processes
+
+def get_cached_latest_update_time():
+    """Timestamp of the newest update, or None; cached briefly for pollers"""
+    cached = _cache.get(LATEST_UPDATE_TIME_CACHE_KEY)
+    if cached is not None:
+        return cached[0]
+    latest = db.session.query(func.max(Update.timestamp)).scalar()
+    # Wrapped in a tuple so an empty table (None) is cached too
+    _cache.set(LATEST_UPDATE_TIME_CACHE_KEY, (latest,), ttl=2)
+    return latest
+
+def get_cached_updates_this_week():
+    """Number of updates posted in the last 7 days, for the /updates stats"""
+    count = _cache.get(UPDATES_THIS_WEEK_CACHE_KEY)
+    if count is None:
+        count = db.session.query(func.count(Update.id)).filter(Update.timestamp >= get_hours_ago(24 * 7)).scalar()
+        # The window slides, so expire even when no update is posted
+        _cache.set(UPDATES_THIS_WEEK_CACHE_KEY, count, ttl=60)
+    return count
+
+def invalidate_update_caches():
+    """Drop cached update aggregates after updates are added, edited or removed"""
+    for key in UPDATE_AGGREGATE_CACHE_KEYS:
+        _cache.delete(key)
+
+# Row counts for the SOP and lesson listing pages, dropped on add/delete/restore
+SOP_COUNT_CACHE_KEY = "sop_summaries_count"
+LESSON_COUNT_CACHE_KEY = "lessons_learned_count"
+
+def get_cached_row_count(model, cache_key):
+    """count(id) over ``model``, cached for a minute"""
+    count = _cache.get(cache_key)
+    if count is None:
+        count = db.session.query(func.count(model.id)).scalar()
+        _cache.set(cache_key, count, ttl=60)
     return count
 
 def get_cached_recent_updates(limit=10):
     """Cache recent updates for performance with proper session management"""
     cache_key = f"recent_updates_{limit}"
-    current_time = time.time()
-
-    if cache_key in _cache:
-        cached_time, updates = _cache[cache_key]
-        if current_time - cached_time < 300:  # Cache for 5 minutes - increased
-            return updates
-        else:
-            del _cache[cache_key]
+    updates = _cache.get(cache_key)
+    if updates is not None:
+        return updates
 
     try:
         recent_updates = Update.query.order_by(Update.timestamp.desc()).limit(limit).all()
@@ -228,7 +377,7 @@ def get_cached_recent_updates(limit=10):
                 'timestamp': update.timestamp
             })
 
-        _cache[cache_key] = (current_time, updates_data)
+        _cache.set(cache_key, updates_data, ttl=300)  # Cache for 5 minutes - increased
         return updates_data
     except Exception as e:
         logger.warning(f"Error in get_cached_recent_updates: {e}")
@@ -243,18 +392,13 @@ def get_cached_recent_updates(limit=10):
 def get_cached_sop_summaries(limit=10):
     """Cache SOP summaries for performance with proper session management"""
     cache_key = f"sop_summaries_{limit}"
-    current_time = time.time()
-
-    if cache_key in _cache:
-        cached_time, summaries = _cache[cache_key]
-        if current_time - cached_time < 600:  # Cache for 10 minutes - increased
-            return summaries
-        else:
-            del _cache[cache_key]
+    summaries = _cache.get(cache_key)
+    if summaries is not None:
+        return summaries
 
     try:
         summaries = SOPSummary.query.order_by(SOPSummary.created_at.desc()).limit(limit).all()
-        _cache[cache_key] = (current_time, summaries)
+        _cache.set(cache_key, summaries, ttl=600)  # Cache for 10 minutes - increased
         return summaries
     except Exception as e:
         logger.warning(f"Error in get_cached_sop_summaries: {e}")
@@ -269,18 +413,13 @@ def get_cached_sop_summaries(limit=10):
 def get_cached_lessons_learned(limit=10):
     """Cache lessons learned for performance with proper session management"""
     cache_key = f"lessons_learned_{limit}"
-    current_time = time.time()
-
-    if cache_key in _cache:
-        cached_time, lessons = _cache[cache_key]
-        if current_time - cached_time < 600:  # Cache for 10 minutes - increased
-            return lessons
-        else:
-            del _cache[cache_key]
+    lessons = _cache.get(cache_key)
+    if lessons is not None:
+        return lessons
 
     try:
         lessons = LessonLearned.query.order_by(LessonLearned.created_at.desc()).limit(limit).all()
-        _cache[cache_key] = (current_time, lessons)
+        _cache.set(cache_key, lessons, ttl=600)  # Cache for 10 minutes - increased
         return lessons
     except Exception as e:
         logger.warning(f"Error in get_cached_lessons_learned: {e}")
@@ -299,14 +438,9 @@ def get_cached_read_counts(update_ids):
 
     # Create a cache key based on the update IDs
     cache_key = f"read_counts_{hash(tuple(sorted(update_ids)))}"
-    current_time = time.time()
-
-    if cache_key in _cache:
-        cached_time, read_counts = _cache[cache_key]
-        if current_time - cached_time < 180:  # Cache for 3 minutes
-            return read_counts
-        else:
-            del _cache[cache_key]
+    read_counts = _cache.get(cache_key)
+    if read_counts is not None:
+        return read_counts
 
     try:
         # Ensure connection is clean before this query
@@ -319,7 +453,7 @@ def get_cached_read_counts(update_ids):
             .all()
         )
 
-        _cache[cache_key] = (current_time, read_counts)
+        _cache.set(cache_key, read_counts, ttl=180)  # Cache for 3 minutes
         return read_counts
     except Exception as e:
         logger.warning(f"Error in get_cached_read_counts: {e}")
@@ -331,8 +465,154 @@ def get_cached_read_counts(update_ids):
         # Return empty dict on error
         return {}
 
+# Message prefix loaded per row on /updates; show.html truncates to 300 chars
+UPDATE_LIST_MESSAGE_CHARS = 500
+
+def parse_page_cursor(args):
+    """(after_ts, after_id) from ?after_ts=...&after_id=..., or (None, None)"""
+    try:
+        return datetime.fromisoformat(args["after_ts"]), int(args["after_id"])
+    except (KeyError, ValueError, TypeError):
+        return None, None
+
+def seek_page(model, page, per_page, after_ts=None, after_id=None):
+    """One newest-first page of ``model`` rows and whether another page follows.
+
+    With a cursor (created_at and id of the previous page's last row) the page
+    starts with an index seek; plain ?page=N links fall back to OFFSET.
+    """
+    query = model.query.order_by(model.created_at.desc(), model.id.desc())
+    if after_ts is not None:
+        query = query.filter(tuple_(model.created_at, model.id) < tuple_(after_ts, after_id))
+    else:
+        query = query.offset((page - 1) * per_page)
+    # One extra row tells us whether there is a next page
+    rows = query.limit(per_page + 1).all()
+    return rows[:per_page], len(rows) > per_page
+
+def page_cursor(rows):
+    """Cursor query args pointing just past the last of ``rows``"""
+    last = rows[-1]
+    return {"after_ts": last.created_at.isoformat(), "after_id": last.id}
+
+def parse_tags(raw):
+    """Comma-separated form value -> list of non-empty tags, or None"""
+    return _TAG_RE.findall(raw) or None
+
+# Search statement for /search: one UNION ALL with a branch per category,
+# built once per filter combination and reused with bound parameters so
+# SQLAlchemy's compiled cache is hit on every request. Full-text branches take
+# :q_text and rank by ts_rank; ILIKE branches take :q.
+SEARCH_LIMIT_PER_CATEGORY = 20
+SEARCH_SNIPPET_LENGTH = 200
+SEARCH_CATEGORIES = ("update", "sop", "lesson")  # Display order
+
+def _snippet_column(column):
+    # One character past the snippet length tells search() to add "..."
+    return func.substr(column, 1, SEARCH_SNIPPET_LENGTH + 1)
+
+def search_snippet(text):
+    """Trim a _snippet_column value to the display length"""
+    text = text or ""
+    if len(text) > SEARCH_SNIPPET_LENGTH:
+        return text[:SEARCH_SNIPPET_LENGTH] + "..."
+    return text
+
+def _search_match(model, columns, use_full_text):
+    """(WHERE condition, rank expression or None) for one search branch"""
+    if use_full_text:
+        tsquery = func.plainto_tsquery("english", bindparam("q_text"))
+        return model.search_vector.op("@@")(tsquery), func.ts_rank(model.search_vector, tsquery)
+    pattern = bindparam("q")
+    return or_(*[column.ilike(pattern) for column in columns]), None
+
+def _search_branch(kind, columns, condition, rank, created_at):
+    """Project one category onto the common search result columns"""
+    order_by = [created_at.desc()]
+    if rank is not None:
+        order_by.insert(0, rank.desc())
+    else:
+        rank = literal(0.0, db.Float)
+    return select(
+        cast(columns["id"], db.String).label("id"),
+        columns["title"].label("title"),
+        _snippet_column(columns["content"]).label("content"),
+        literal(kind).label("type"),
+        columns.get("author", null()).label("author"),
+        created_at.label("created_at"),
+        columns.get("process", null()).label("process"),
+        columns.get("tags", cast(null(), DatabaseAgnosticArray())).label("tags"),
+        rank.label("rank"),
+    ).where(condition).order_by(*order_by).limit(SEARCH_LIMIT_PER_CATEGORY)
+
+def _update_search_branch(use_full_text, filter_process):
+    condition, rank = _search_match(Update, (Update.message, Update.name, Update.process), use_full_text)
+    if filter_process:
+        condition = and_(condition, Update.process.ilike(bindparam("process")))
+    columns = {
+        "id": Update.id, "title": Update.name, "content": Update.message,
+        "author": Update.name, "process": Update.process,
+    }
+    return _search_branch("update", columns, condition, rank, Update.timestamp)
+
+def _sop_search_branch(use_full_text, filter_department):
+    condition, rank = _search_match(SOPSummary, (SOPSummary.title, SOPSummary.summary_text), use_full_text)
+    if filter_department:
+        condition = and_(condition, SOPSummary.department.ilike(bindparam("department")))
+    columns = {
+        "id": SOPSummary.id, "title": SOPSummary.title, "content": SOPSummary.summary_text,
+        "tags": SOPSummary.tags,
+    }
+    return _search_branch("sop", columns, condition, rank, SOPSummary.created_at)
+
+def _lesson_search_branch(use_full_text, filter_department):
+    condition, rank = _search_match(
+        LessonLearned, (LessonLearned.title, LessonLearned.content, LessonLearned.summary), use_full_text
+    )
+    if filter_department:
+        condition = and_(condition, LessonLearned.department.ilike(bindparam("department")))
+    # Lessons show their summary, or the content when there is no summary
+    columns = {
+        "id": LessonLearned.id, "title": LessonLearned.title,
+        "content": func.coalesce(func.nullif(LessonLearned.summary, ""), LessonLearned.content),
+        "author": LessonLearned.author, "tags": LessonLearned.tags,
+    }
+    return _search_branch("lesson", columns, condition, rank, LessonLearned.created_at)
+
+@lru_cache(maxsize=None)
+def search_stmt(categories, use_full_text, filter_process, filter_department):
+    """Search statement over ``categories`` (a tuple from SEARCH_CATEGORIES)"""
+    branches = []
+    if "update" in categories:
+        branches.append(_update_search_branch(use_full_text, filter_process))
+    if "sop" in categories:
+        branches.append(_sop_search_branch(use_full_text, filter_department))
+    if "lesson" in categories:
+        branches.append(_lesson_search_branch(use_full_text, filter_department))
+    if len(branches) == 1:
+        return branches[0]
+
+    # Each branch keeps its own ORDER BY/LIMIT inside a subquery
+    combined = union_all(*[select(branch.subquery()) for branch in branches]).subquery()
+    category_order = case(
+        {kind: position for position, kind in enumerate(SEARCH_CATEGORIES)},
+        value=combined.c.type
+    )
+    return select(combined).order_by(category_order, combined.c.rank.desc(), combined.c.created_at.desc())
+
+class LoopinFlask(Flask):
+    """Flask app that only lets the static route be cached long-term"""
+
+    def get_send_file_max_age(self, filename):
+        # STATIC_MAX_AGE is only configured in production; every other
+        # send_file (backups, exports) keeps Flask's no-max-age default
+        max_age = self.config.get("STATIC_MAX_AGE")
+        if max_age and request.endpoint == "static":
+            return max_age
+        return super().get_send_file_max_age(filename)
+
 def create_app(config_name=None):
-    app = Flask(__name__)
+    app = LoopinFlask(__name__)
 
     # Database configuration - ensure PostgreSQL is used consistently
     database_url = os.getenv('DATABASE_URL')
@@ -377,25 +657,51 @@ def create_app(config_name=None):
     try:
         from api.updates import updates_bp as api_bp
         app.register_blueprint(api_bp)
-    except Exception:
+    except Exception as e:
         # Blueprint registration should not break app startup if something is off
-        pass
+        logger.warning(f"Updates API blueprint not registered: {e}")
     
     # Register search API blueprint
     try:
         from api.search import bp as search_bp
         app.register_blueprint(search_bp)
-    except Exception:
+    except Exception as e:
         # Search API registration should not break app startup if something is off
-        pass
+        logger.warning(f"Search API blueprint not registered: {e}")
+
+    # Audit-trail rows are queued and bulk-inserted by a background thread;
+    # on Vercel the process may be frozen or killed after the response, so
+    # they are written at the end of each request instead
+    activity_writer = ActivityLogWriter(app)
+    app.extensions['activity_log_writer'] = activity_writer
+    if os.getenv("VERCEL") == "1" or os.getenv("VERCEL_ENV") is not None:
+        activity_writer.flush_after_requests()
+    else:
+        activity_writer.start()
+
+    # Backup restores run off the request thread; routes get a job id back
+    restore_runner = RestoreJobRunner(app)
+    app.extensions['restore_runner'] = restore_runner
+
+    def get_backup_system():
+        """Shared DatabaseBackupSystem, created on first use.
+
+        Construction can fail on a read-only file system, so it is not done
+        at startup; a failed attempt is retried on the next request.
+        """
+        backup_system = app.extensions.get('backup_system')
+        if backup_system is None:
+            backup_system = app.extensions['backup_system'] = DatabaseBackupSystem()
+        return backup_system
 
     @login_manager.user_loader
     def load_user(user_id):
-        return User.query.get(int(user_id))
+        return get_user_by_id(user_id)
 
     # Security configuration
     app.secret_key = os.getenv("FLASK_SECRET_KEY", "replace-this-with-a-secure-random-string")
     app.config["APP_NAME"] = "LoopIn"
+    app.config["PERF_LOG_ENABLED"] = os.getenv("PERF_LOG_ENABLED", "true").lower() == "true"
 
 
     # Secure session configuration - adjust for Vercel
@@ -412,40 +718,45 @@ def create_app(config_name=None):
     if is_production:
         app.config["SERVER_NAME"] = None  # Disable SERVER_NAME for Vercel
         app.config["PREFERRED_URL_SCHEME"] = "https"  # Force HTTPS on Vercel
+        # Long browser caching for the static route only; see LoopinFlask
+        app.config["STATIC_MAX_AGE"] = STATIC_MAX_AGE
+
+    # Template caching - jinja_options must be set before app.jinja_env is
+    # first used. Keep every template's compiled form in memory, and persist
+    # the bytecode so a fresh worker on the same instance skips re-parsing.
+    # Jinja's default cache directory is per-user, mode 0700 and checked for
+    # ownership, so other local users can't plant bytecode in it.
+    jinja_options = dict(app.jinja_options, cache_size=400)
+    try:
+        jinja_options["bytecode_cache"] = FileSystemBytecodeCache()
+    except (OSError, RuntimeError) as e:
+        logger.warning(f"Jinja bytecode cache disabled: {e}")
+    app.jinja_options = jinja_options
 
-    # Database configuration - DATABASE_URL should be set from the first configuration block
+    # Database configuration - the URL was resolved and cleaned by the first
+    # configuration block (or replaced by config_name); don't re-read the env
     database_url = app.config['SQLALCHEMY_DATABASE_URI']
     if os.getenv("FLASK_ENV") == "development":
         print(f"Using database: {database_url}")
 
     # Skip database type validation for local development with SQLite fallback
     flask_env = os.getenv("FLASK_ENV")
-    database_url = os.getenv('DATABASE_URL')
-
-    # Clean up invalid connection parameters that can cause psycopg2 errors
-    if database_url:
-        from database import clean_database_url
-        database_url = clean_database_url(database_url)
-
-    if not (flask_env == "development" and not database_url):
+    if not (flask_env == "development" and not os.getenv('DATABASE_URL')):
         from database import validate_database_type
         if not validate_database_type():
             logger.warning("Database type validation failed - using fallback configuration")
 
+    db_scheme = urlparse(database_url).scheme
+
     # Additional validation for SQLite detection
-    parsed = urlparse(database_url)
-    if parsed.scheme in ("sqlite", "sqlite3"):
+    if db_scheme in ("sqlite", "sqlite3"):
         logger.warning("WARNING: Using SQLite - this may cause issues in production")
 
-    parsed = urlparse(database_url)
-    if parsed.scheme not in ("postgresql", "postgres", "sqlite", "sqlite3"):
-        raise RuntimeError(f"Unsupported DB scheme: {parsed.scheme}")
-
-    app.config["SQLALCHEMY_DATABASE_URI"] = database_url
-    app.config["SQLALCHEMY_TRACK_MODIFICATIONS"] = False
+    if db_scheme not in ("postgresql", "postgres", "sqlite", "sqlite3"):
+        raise RuntimeError(f"Unsupported DB scheme: {db_scheme}")
 
     # Configure SSL for PostgreSQL with Vercel-friendly defaults
-    if parsed.scheme in ("postgresql", "postgres"):
+    if db_scheme in ("postgresql", "postgres"):
         ssl_config = {}
 
         # Set SSL mode with Vercel-friendly defaults
@@ -461,6 +772,14 @@ def create_app(config_name=None):
         if os.getenv("PG_SSLKEY"):
             ssl_config["sslkey"] = os.getenv("PG_SSLKEY")
 
+        # Pool sizing: a serverless instance serves one request at a time, so
+        # keep its pool minimal; long-running threaded servers get a pool big
+        # enough that request threads don't queue on pool_timeout.
+        # SQLALCHEMY_POOL_SIZE / SQLALCHEMY_MAX_OVERFLOW override both.
+        is_serverless = os.getenv("VERCEL") == "1" or os.getenv("VERCEL_ENV") is not None
+        pool_size = int(os.getenv("SQLALCHEMY_POOL_SIZE", 1 if is_serverless else 10))
+        max_overflow = int(os.getenv("SQLALCHEMY_MAX_OVERFLOW", 2 if is_serverless else 20))
+
         # Set connection arguments for Vercel with optimized connection pooling
         app.config["SQLALCHEMY_ENGINE_OPTIONS"] = {
             "connect_args": ssl_config,
@@ -468,8 +787,8 @@ def create_app(config_name=None):
             "pool_pre_ping": True,
             "pool_recycle": 300,  # Recycle connections every 5 minutes
             "pool_timeout": 20,   # Connection timeout
-            "pool_size": 1,       # Minimal pool size for serverless
-            "max_overflow": 2,    # Limited overflow
+            "pool_size": pool_size,
+            "max_overflow": max_overflow,
             # Transaction isolation and connection stability
             "isolation_level": "READ_COMMITTED",
             "echo": False,
@@ -477,6 +796,10 @@ def create_app(config_name=None):
             # Performance optimizations
             "pool_use_lifo": True,  # Use LIFO for better cache locality
             "poolclass": None,  # Use default pool class
+            # Multi-row VALUES for INSERT executemany (bulk_insert_mappings,
+            # ORM flushes) and psycopg2 execute_batch for UPDATE/DELETE
+            "executemany_mode": "values_plus_batch",
+            "insertmanyvalues_page_size": 1000,
             # Additional stability settings
             "connect_args": {
                 **ssl_config,
@@ -491,6 +814,13 @@ def create_app(config_name=None):
             }
         }
 
+        # Behind pgbouncer (transaction pooling) let the bouncer do the pooling
+        if os.getenv("PGBOUNCER", "").lower() == "true":
+            engine_options = app.config["SQLALCHEMY_ENGINE_OPTIONS"]
+            for pool_option in ("pool_size", "max_overflow", "pool_timeout", "pool_use_lifo", "pool_recycle"):
+                engine_options.pop(pool_option, None)
+            engine_options["poolclass"] = NullPool
+
         logger.info(f"SQLAlchemy engine options configured for Vercel PostgreSQL")
     else:
         # Non-PostgreSQL databases use optimized settings
@@ -648,161 +978,128 @@ def create_app(config_name=None):
                     raise RuntimeError(f"Database table creation failed: {create_e}")
 
     # Activity Logging Helper
+    def activity_row(action, entity_type, entity_id, entity_title=None, details=None):
+        """Build an ActivityLog row for the current request's user and client"""
+        # Get client IP address
+        client_ip = request.environ.get('HTTP_X_FORWARDED_FOR', request.environ.get('REMOTE_ADDR', 'Unknown'))
+        if ',' in client_ip:
+            client_ip = client_ip.split(',')[0].strip()
+
+        # X-Forwarded-For is client-supplied; clamp to the column lengths so an
+        # oversized value can't fail the batched insert it ends up in
+        return {
+            'user_id': session.get("user_id"),
+            'action': action,
+            'entity_type': entity_type,
+            'entity_id': str(entity_id),
+            'entity_title': entity_title[:255] if entity_title else entity_title,
+            'timestamp': now_utc(),
+            'ip_address': client_ip[:45],
+            'user_agent': request.headers.get('User-Agent', 'Unknown'),
+            'details': details
+        }
+
     def log_activity(action, entity_type, entity_id, entity_title=None, details=None):
         """Log user activity for audit trail"""
         try:
-            user_id = session.get("user_id")
-
-            # Get client IP address
-            client_ip = request.environ.get('HTTP_X_FORWARDED_FOR', request.environ.get('REMOTE_ADDR', 'Unknown'))
-            if ',' in client_ip:
-                client_ip = client_ip.split(',')[0].strip()
-
-            # Get user agent
-            user_agent = request.headers.get('User-Agent', 'Unknown')
-
-            activity = ActivityLog(
-                user_id=user_id,
-                action=action,
-                entity_type=entity_type,
-                entity_id=str(entity_id),
-                entity_title=entity_title,
-                timestamp=now_utc(),
-                ip_address=client_ip,
-                user_agent=user_agent,
-                details=details
-            )
-
-            db.session.add(activity)
-            db.session.commit()
+            # Written in batches by the background writer, off the request path
+            activity_writer.enqueue(activity_row(action, entity_type, entity_id, entity_title, details))
         except Exception as e:
             # Don't let activity logging break the main functionality
             if os.getenv("FLASK_ENV") == "development":
                 print(f"Activity logging failed: {e}")
 
     # Archive Helper Functions
-    def archive_update(update):
-        """Archive an update before deletion"""
-        try:
-            # Validate update object
-            if not update or not update.id:
-                raise ValueError("Invalid update object")
+    def archive_rows(archive_model, ids):
+        """Copy source rows into their archive table with one INSERT ... SELECT.
 
-            # Get archiving user
-            user_id = session.get("user_id")
-            if not user_id:
-                app.logger.warning("Archiving update without user context")
-
-            # Check if already archived
-            existing_archive = ArchivedUpdate.query.get(update.id)
-            if existing_archive:
-                app.logger.warning(f"Update {update.id} already archived")
-                return True
+        Rows that are already archived are skipped via ON CONFLICT DO NOTHING.
+        The insert joins the caller's transaction, so the archive and the
+        following delete are committed together. Returns the number of rows
+        newly archived.
+        """
+        source_model, columns = ARCHIVE_COLUMNS[archive_model]
+        source = source_model.__table__
+        dialect = db.engine.dialect.name
+
+        source_columns = []
+        for name in columns:
+            column = source.c[name]
+            if name == 'tags' and dialect == 'postgresql':
+                # Source tags are a varchar[]; the archive column is JSON
+                column = func.to_json(column)
+            source_columns.append(column)
+
+        rows = select(
+            *source_columns,
+            literal(now_utc(), db.DateTime),
+            literal(session.get("user_id"), db.Integer),
+        ).where(source.c.id.in_(ids))
+
+        insert = pg_insert if dialect == 'postgresql' else sqlite_insert
+        stmt = insert(archive_model.__table__).from_select(
+            columns + ['archived_at', 'archived_by'], rows
+        ).on_conflict_do_nothing(index_elements=['id'])
+        return db.session.execute(stmt).rowcount
+
+    def unarchive_row(archive_model, item_id, *returning):
+        """Move one archived row back into its source table.
+
+        The row is copied with INSERT ... SELECT and then removed with
+        DELETE ... RETURNING, so nothing is loaded into the session. Both
+        statements join the caller's transaction. Returns the ``returning``
+        columns of the removed row, or None if no such row was archived.
+        """
+        source_model, columns = ARCHIVE_COLUMNS[archive_model]
+        archive = archive_model.__table__
+
+        archive_columns = []
+        for name in columns:
+            column = archive.c[name]
+            if name == 'tags' and db.engine.dialect.name == 'postgresql':
+                # Archive tags are JSON; the source column is a varchar[]
+                column = case(
+                    (func.json_typeof(column) == 'array',
+                     func.array(select(func.json_array_elements_text(column)).correlate(archive).scalar_subquery())),
+                    else_=null()
+                )
+            archive_columns.append(column)
 
-            # Create archive record
-            archived_update = ArchivedUpdate(
-                id=update.id,
-                name=update.name,
-                process=update.process,
-                message=update.message,
-                timestamp=update.timestamp,
-                archived_at=now_utc(),
-                archived_by=user_id
+        copied = db.session.execute(
+            source_model.__table__.insert().from_select(
+                columns, select(*archive_columns).where(archive.c.id == item_id)
             )
+        ).rowcount
+        if not copied:
+            return None
 
-            # Save the archive
-            db.session.add(archived_update)
-            db.session.commit()
-            
-            app.logger.info(f"Successfully archived update {update.id}")
-            return True
-        except Exception as e:
-            db.session.rollback()
-            app.logger.error(f"Failed to archive update {update.id if update and hasattr(update, 'id') else 'unknown'}: {str(e)}")
-            return False
-
-    def archive_sop(sop):
-        """Archive a SOP before deletion"""
-        try:
-            # Validate SOP object
-            if not sop or not sop.id:
-                raise ValueError("Invalid SOP object")
+        return db.session.execute(
+            archive.delete().where(archive.c.id == item_id).returning(*returning)
+        ).first()
 
-            # Get archiving user
-            user_id = session.get("user_id")
-            if not user_id:
-                app.logger.warning("Archiving SOP without user context")
-
-            # Check if already archived
-            existing_archive = ArchivedSOPSummary.query.get(sop.id)
-            if existing_archive:
-                app.logger.warning(f"SOP {sop.id} already archived")
-                return True
-
-            # Create archive record
-            archived_sop = ArchivedSOPSummary(
-                id=sop.id,
-                title=sop.title,
-                summary_text=sop.summary_text,
-                department=sop.department,
-                tags=sop.tags,
-                created_at=sop.created_at,
-                archived_at=now_utc(),
-                archived_by=user_id
-            )
+    def archive_item(archive_model, item, label):
+        """Archive a single update, SOP or lesson before deletion.
 
-            # Save the archive
-            db.session.add(archived_sop)
-            db.session.commit()
-            
-            app.logger.info(f"Successfully archived SOP {sop.id}")
-            return True
-        except Exception as e:
-            db.session.rollback()
-            app.logger.error(f"Failed to archive SOP {sop.id if sop and hasattr(sop, 'id') else 'unknown'}: {str(e)}")
-            return False
-
-    def archive_lesson(lesson):
-        """Archive a lesson learned before deletion"""
+        ``label`` names the item in log messages. Returns False if archiving
+        failed, in which case the caller must not delete the item.
+        """
         try:
-            # Validate lesson object
-            if not lesson or not lesson.id:
-                raise ValueError("Invalid lesson object")
+            # Validate the item
+            if not item or not item.id:
+                raise ValueError(f"Invalid {label} object")
 
-            # Get archiving user
-            user_id = session.get("user_id")
-            if not user_id:
-                app.logger.warning("Archiving lesson without user context")
+            if not session.get("user_id"):
+                app.logger.warning(f"Archiving {label} without user context")
 
-            # Check if already archived
-            existing_archive = ArchivedLessonLearned.query.get(lesson.id)
-            if existing_archive:
-                app.logger.warning(f"Lesson {lesson.id} already archived")
+            if not archive_rows(archive_model, [item.id]):
+                app.logger.warning(f"{label.capitalize()} {item.id} already archived")
                 return True
 
-            # Create archive record
-            archived_lesson = ArchivedLessonLearned(
-                id=lesson.id,
-                title=lesson.title,
-                content=lesson.content,
-                summary=lesson.summary,
-                author=lesson.author,
-                department=lesson.department,
-                tags=lesson.tags,
-                created_at=lesson.created_at,
-                archived_at=now_utc(),
-                archived_by=user_id
-            )
-
-            # Save the archive
-            db.session.add(archived_lesson)
-            db.session.commit()
-            
-            app.logger.info(f"Successfully archived lesson {lesson.id}")
+            app.logger.info(f"Successfully archived {label} {item.id}")
             return True
         except Exception as e:
             db.session.rollback()
-            app.logger.error(f"Failed to archive lesson {lesson.id if lesson and hasattr(lesson, 'id') else 'unknown'}: {str(e)}")
+            app.logger.error(f"Failed to archive {label} {item.id if item and hasattr(item, 'id') else 'unknown'}: {str(e)}")
             return False
 
     # Auth Helpers
@@ -817,24 +1114,14 @@ def create_app(config_name=None):
 
     @app.context_processor
     def inject_current_user():
-        """Inject current user into template context with caching"""
-        user_id = session.get("user_id")
-        if user_id:
-            # Use get() instead of filter_by().first() for better performance
-            user = User.query.get(user_id)
-            return dict(current_user=user)
-        return dict(current_user=None)
-
-    @app.context_processor
-    def inject_user_role_info():
-        """
-        Inject user role information into templates for conditional rendering.
-        """
-        user_id = session.get("user_id")
-        if user_id:
-            role_info = get_cached_user_role(user_id)
-            return dict(user_role=role_info)
-        return dict(user_role={'is_admin': False, 'is_editor': False, 'is_writer': False, 'is_deleter': False, 'is_exporter': False})
+        """Inject the current user and their role information into templates"""
+        # Shares the per-request lookup with load_user and the role decorators;
+        # role flags are read off the already loaded user
+        user = get_current_user()
+        return dict(
+            current_user=user,
+            user_role=get_user_role_info(user) if user else DEFAULT_USER_ROLE
+        )
 
     @app.context_processor
     def inject_now_utc():
@@ -857,8 +1144,6 @@ def create_app(config_name=None):
         if not iso_string:
             return 'N/A'
         try:
-            # Parse the ISO string to datetime
-            from datetime import datetime
             # Handle different ISO formats
             if iso_string.endswith('Z'):
                 iso_string = iso_string.replace('Z', '+00:00')
@@ -881,11 +1166,9 @@ def create_app(config_name=None):
         """Strip HTML tags from text for clean display"""
         if not text:
             return ''
-        import re
         # Remove HTML tags
-        clean_text = re.sub(r'<[^>]+>', '', text)
+        clean_text = _HTML_TAG_RE.sub('', text)
         # Decode HTML entities
-        import html
         clean_text = html.unescape(clean_text)
         return clean_text
 
@@ -895,17 +1178,12 @@ def create_app(config_name=None):
         if not text:
             return ''
 
-        import re
-        from html import unescape
+        text_without_tags = _HTML_TAG_RE.sub('', text)
 
         # If text is shorter than length, return as is
-        if len(strip_html_filter(text)) <= length:
+        if len(html.unescape(text_without_tags)) <= length:
             return text
 
-        # Find all HTML tags
-        tags = re.findall(r'<[^>]+>', text)
-        text_without_tags = re.sub(r'<[^>]+>', '', text)
-
         # Truncate the text without tags
         if killwords:
             truncated = text_without_tags[:length]
@@ -928,6 +1206,15 @@ def create_app(config_name=None):
 
         return result
 
+    # Built assets only change on deploy, so check for them once at startup
+    built_css_path = os.path.join(app.root_path, "static", "dist", "styles.css")
+    template_is_production = (
+        str(app.config.get('ENV', '')).lower() == 'production'
+        or os.getenv('FLASK_ENV', '').lower() == 'production'
+        or os.getenv('ENV', '').lower() == 'production'
+    )
+    built_assets_context = dict(built_css=os.path.exists(built_css_path), is_production=template_is_production)
+
     @app.context_processor
     def built_assets_available():
         """Expose a small flag to templates indicating whether built CSS exists.
@@ -936,37 +1223,42 @@ def create_app(config_name=None):
         (e.g. `static/dist/styles.css`) when present, otherwise fall back
         to a CDN link. This keeps CI builds optional and safe for local dev.
         """
-        try:
-            static_path = os.path.join(app.root_path, "static", "dist", "styles.css")
-            is_prod = str(app.config.get('ENV', '')).lower() == 'production' or os.getenv('FLASK_ENV', '').lower() == 'production' or os.getenv('ENV', '').lower() == 'production'
-            return dict(built_css=os.path.exists(static_path), is_production=is_prod)
-        except Exception:
-            return dict(built_css=False, is_production=False)
+        if app.debug:
+            # Pick up a freshly built stylesheet without restarting
+            return dict(built_css=os.path.exists(built_css_path), is_production=template_is_production)
+        return built_assets_context
 
     # Routes
     @app.route("/health")
     @performance_logger
     def health():
-        """Optimized health check endpoint with performance monitoring"""
+        """Optimized health check endpoint with performance monitoring
+
+        Liveness is a SELECT 1 cached for DB_HEALTH_TTL seconds so frequent
+        probes don't compete with real traffic for pool connections.
+        ``/health?deep=1`` runs the full readiness check instead.
+        """
         try:
-            # Comprehensive database readiness check
-            from database import ensure_database_ready
-            if not ensure_database_ready():
+            deep = request.args.get("deep") in ("1", "true")
+            if deep:
+                # Comprehensive database readiness check
+                if not ensure_database_ready():
+                    return jsonify({
+                        "status": "error",
+                        "message": "Database not ready",
+                        "timestamp": now_utc().isoformat()
+                    }), 503
+
+            db_ok, db_error = check_database_alive(force=deep)
+            if not db_ok:
                 return jsonify({
                     "status": "error",
-                    "message": "Database not ready",
+                    "message": f"Database not reachable: {db_error}",
                     "timestamp": now_utc().isoformat()
                 }), 503
 
-            # Test database connection efficiently
-            db.session.execute(text("SELECT 1"))
-
             # Memory usage monitoring for free tier
-            import psutil
-            import os
-            process = psutil.Process(os.getpid())
-            memory_info = process.memory_info()
-            memory_mb = memory_info.rss / 1024 / 1024
+            memory_mb = get_process_memory_mb()
 
             out = {
                 "status": "ok",
@@ -995,7 +1287,7 @@ def create_app(config_name=None):
     @app.route("/lessons_learned/view/<int:lesson_id>")
     @login_required
     def view_lesson_learned(lesson_id):
-        lesson = LessonLearned.query.get(lesson_id)
+        lesson = db.session.get(LessonLearned, lesson_id)
         if not lesson:
             flash("Lesson Learned not found.")
             return redirect(url_for("list_lessons_learned"))
@@ -1026,96 +1318,68 @@ def create_app(config_name=None):
         available_departments = ["ABC", "XYZ", "AB"]  # Fixed to match process options
 
         if query:
-            # Limit search results to prevent performance issues
-            limit_per_category = 20
-
             # Case-insensitive search
             query_filter = f"%{query}%"
 
+            # On PostgreSQL, every category is matched through its GIN-indexed
+            # full-text vector; ILIKE stays for other backends and for
+            # queries that use explicit LIKE wildcards
+            use_full_text = (
+                db.engine.dialect.name == "postgresql"
+                and "%" not in query and "_" not in query
+            )
+
+            params = {"q_text": query} if use_full_text else {"q": query_filter}
+            categories = tuple(
+                kind for kind, name in zip(SEARCH_CATEGORIES, ("updates", "sops", "lessons"))
+                if not category or category == name
+            )
+
+            # Apply process filter (updates) and department filter (SOPs, lessons)
+            if process:
+                params["process"] = f"%{process}%"
+            if department:
+                params["department"] = f"%{department}%"
+
             try:
-                # Use a single session for all queries to prevent connection pool exhaustion
-                with db.session.begin():
-                    # Search Updates (if no category filter or category is 'updates')
-                    if not category or category == "updates":
-                        updates_query = Update.query.filter(
-                            or_(
-                                Update.message.ilike(query_filter),
-                                Update.name.ilike(query_filter),
-                                Update.process.ilike(query_filter)
-                            )
-                        )
-
-                        # Apply process filter
-                        if process:
-                            updates_query = updates_query.filter(Update.process.ilike(f"%{process}%"))
-
-                        updates_rows = updates_query.order_by(Update.timestamp.desc()).limit(limit_per_category).all()
-
-                        for upd in updates_rows:
-                            results.append({
-                                "id": upd.id,
-                                "title": f"{upd.process} - {upd.name}",
-                                "content": upd.message[:200] + ("..." if len(upd.message) > 200 else ""),
-                                "type": "update",
-                                "url": url_for("view_update", update_id=upd.id),
-                                "author": upd.name,
-                                "created_at": upd.timestamp,
-                                "process": upd.process
-                            })
-
-                    # Search SOP Summaries (if no category filter or category is 'sops')
-                    if not category or category == "sops":
-                        sops_query = SOPSummary.query.filter(
-                            or_(
-                                SOPSummary.title.ilike(query_filter),
-                                SOPSummary.summary_text.ilike(query_filter)
-                            )
-                        )
-
-                        # Apply department filter
-                        if department:
-                            sops_query = sops_query.filter(SOPSummary.department.ilike(f"%{department}%"))
-
-                        sops_rows = sops_query.order_by(SOPSummary.created_at.desc()).limit(limit_per_category).all()
-
-                        for sop in sops_rows:
-                            results.append({
-                                "id": sop.id,
-                                "title": sop.title,
-                                "content": sop.summary_text[:200] + ("..." if len(sop.summary_text) > 200 else ""),
-                                "type": "sop",
-                                "url": url_for("view_sop_summary", summary_id=sop.id),
-                                "created_at": sop.created_at,
-                                "tags": sop.tags or []
-                            })
-
-                    # Search Lessons Learned (if no category filter or category is 'lessons')
-                    if not category or category == "lessons":
-                        lessons_query = LessonLearned.query.filter(
-                            or_(
-                                LessonLearned.title.ilike(query_filter),
-                                LessonLearned.content.ilike(query_filter),
-                                LessonLearned.summary.ilike(query_filter)
-                            )
-                        )
-
-                        # Apply department filter
-                        if department:
-                            lessons_query = lessons_query.filter(LessonLearned.department.ilike(f"%{department}%"))
-
-                        lessons_rows = lessons_query.order_by(LessonLearned.created_at.desc()).limit(limit_per_category).all()
-
-                        for lesson in lessons_rows:
-                            results.append({
-                                "id": lesson.id,
-                                "title": lesson.title,
-                                "content": (lesson.summary or lesson.content or "")[:200] + ("..." if len(lesson.summary or lesson.content or "") > 200 else ""),
-                                "type": "lesson",
-                                "url": url_for("view_lesson_learned", lesson_id=lesson.id),
-                                "author": lesson.author,
-                                "created_at": lesson.created_at,
-                                "tags": lesson.tags or []
-                            })
+                rows = []
+                if categories:
+                    stmt = search_stmt(categories, use_full_text, bool(process), bool(department))
+                    rows = db.session.execute(stmt, params).mappings().all()
+
+                for row in rows:
+                    if row["type"] == "update":
+                        results.append({
+                            "id": row["id"],
+                            "title": f"{row['process']} - {row['title']}",
+                            "content": search_snippet(row["content"]),
+                            "type": "update",
+                            "url": url_for("view_update", update_id=row["id"]),
+                            "author": row["author"],
+                            "created_at": row["created_at"],
+                            "process": row["process"]
+                        })
+                    elif row["type"] == "sop":
+                        results.append({
+                            "id": int(row["id"]),
+                            "title": row["title"],
+                            "content": search_snippet(row["content"]),
+                            "type": "sop",
+                            "url": url_for("view_sop_summary", summary_id=int(row["id"])),
+                            "created_at": row["created_at"],
+                            "tags": row["tags"] or []
+                        })
+                    else:
+                        results.append({
+                            "id": int(row["id"]),
+                            "title": row["title"],
+                            "content": search_snippet(row["content"]),
+                            "type": "lesson",
+                            "url": url_for("view_lesson_learned", lesson_id=int(row["id"])),
+                            "author": row["author"],
+                            "created_at": row["created_at"],
+                            "tags": row["tags"] or []
+                        })
 
             except Exception as e:
                 logger.error(f"Database error during search: {e}")
@@ -1127,7 +1391,11 @@ def create_app(config_name=None):
                 # Return empty results on error
                 results = []
 
-        return render_template("search_results.html",
+        # Stream the page so the large template head reaches the client
+        # while the result sections are still rendering. Flashes are popped
+        # up front: the session cookie can't change once streaming starts.
+        get_flashed_messages(with_categories=True)
+        return stream_template("search_results.html",
                               query=query,
                               results=results,
                               filters=filters,
@@ -1139,43 +1407,10 @@ def create_app(config_name=None):
     @app.route("/")
     @performance_logger
     def home():
-        try:
-            # Quick connection check - skip full health check for performance
-            try:
-                db.session.execute(text("SELECT 1"))
-            except:
-                logger.warning("Database connection issue detected, using cached data only")
-
-            # Use cached data for better performance - parallel loading for speed
-            summaries = get_cached_sop_summaries(10)
-            lessons = get_cached_lessons_learned(10)
-            latest_updates = get_cached_recent_updates(5)
-
-            updates_data = []
-            current_time = now_utc()
-
-            # Process updates without read counts for faster initial load
-            for update in latest_updates:
-                update_dict = update.copy()
-                update_dict['read_count'] = 0  # Skip read counts for speed
-                update_dict['is_new'] = is_within_hours(update['timestamp'], 24, current_time)
-                updates_data.append(update_dict)
-
-            return render_template("home.html", app_name=app.config["APP_NAME"],
-                                  summaries=summaries, lessons=lessons, updates=updates_data,
-                                  excel_export_available=EXCEL_EXPORT_AVAILABLE)
-        except Exception as e:
-            logger.error(f"Error loading home page: {e}")
-            # Ensure database session is clean on error
-            try:
-                db.session.rollback()
-                db.session.close()
-            except:
-                pass
-            # Return a basic template without updates if there's an error
-            return render_template("home.html", app_name=app.config["APP_NAME"],
-                                  summaries=[], lessons=[], updates=[],
-                                  excel_export_available=EXCEL_EXPORT_AVAILABLE)
+        # The landing page is static navigation: home.html renders no update,
+        # SOP or lesson data, so nothing is queried here
+        return render_template("home.html", app_name=app.config["APP_NAME"],
+                              excel_export_available=EXCEL_EXPORT_AVAILABLE)
 
     @app.route("/updates")
     @performance_logger
@@ -1197,7 +1432,7 @@ def create_app(config_name=None):
         if highlight_update:
             try:
                 # Find the position of the highlighted update
-                highlight_query = db.session.query(Update)
+                highlight_query = db.session.query(Update.id)
 
                 # Apply the same filters as the main query
                 if selected_process:
@@ -1214,7 +1449,7 @@ def create_app(config_name=None):
                     highlight_query = highlight_query.order_by(Update.timestamp.desc())
 
                 # Get all IDs in order to find the position
-                all_ids = [upd.id for upd in highlight_query.all()]
+                all_ids = [row.id for row in highlight_query.all()]
                 if highlight_update in all_ids:
                     position = all_ids.index(highlight_update)
                     page = (position // per_page) + 1
@@ -1224,8 +1459,20 @@ def create_app(config_name=None):
         # Calculate offset for pagination
         offset = (page - 1) * per_page
 
-        # Optimized base query with pagination
-        base_query = db.session.query(Update)
+        # Optimized base query with pagination. Only the listed columns are
+        # loaded; show.html truncates the message to 300 chars, so a prefix
+        # is enough
+        base_query = db.session.query(
+            Update.id,
+            Update.name,
+            Update.process,
+            Update.timestamp,
+            func.substr(Update.message, 1, UPDATE_LIST_MESSAGE_CHARS).label("message"),
+            # "New" badge flag, evaluated by the database against one cutoff
+            (Update.timestamp >= get_hours_ago(24)).label("is_new"),
+            # Total matching rows, computed in the same statement as the page
+            func.count().over().label("total_count")
+        )
 
         # Apply process filter if specified
         if selected_process:
@@ -1241,53 +1488,45 @@ def create_app(config_name=None):
         else:  # newest (default)
             base_query = base_query.order_by(Update.timestamp.desc())
 
-        # Get total count for pagination with optimized query
-        total_updates = base_query.count()
-
         # Apply pagination
         paginated_updates = base_query.offset(offset).limit(per_page).all()
 
+        # Total count for pagination comes from the window column; only a
+        # page past the end (no rows) needs a separate COUNT
+        if paginated_updates:
+            total_updates = paginated_updates[0].total_count
+        else:
+            count_query = db.session.query(func.count(Update.id))
+            if selected_process:
+                count_query = count_query.filter(Update.process == selected_process)
+            total_updates = count_query.scalar()
+
         # Get read counts efficiently using cached function
         update_ids = [upd.id for upd in paginated_updates]
         read_counts = get_cached_read_counts(update_ids) if update_ids else {}
 
         updates = []
-        current_time = now_utc()
         for upd in paginated_updates:
-            d = upd.to_dict()
+            d = {
+                "id": upd.id,
+                "name": upd.name,
+                "process": upd.process,
+                "message": upd.message,
+                "timestamp": format_ist(upd.timestamp, "%d/%m/%Y, %H:%M:%S"),
+            }
             d['read_count'] = read_counts.get(upd.id, 0)
-            d['is_new'] = is_within_hours(upd.timestamp, 24, current_time)
+            d['is_new'] = bool(upd.is_new)
             d['timestamp_obj'] = upd.timestamp
             d['is_highlighted'] = (highlight_update and upd.id == highlight_update)
             updates.append(d)
 
         # Get additional data for template using optimized caching
-        current_time = time.time()
 
-        # Cache authors with optimized logic
-        cache_key_authors = "updates_page_authors"
-        if cache_key_authors not in _cache or current_time - _cache[cache_key_authors][0] >= 300:
-            unique_authors = [row[0] for row in db.session.query(Update.name).filter(Update.name.isnot(None)).distinct().all()]
-            _cache[cache_key_authors] = (current_time, unique_authors)
-        else:
-            unique_authors = _cache[cache_key_authors][1]
+        # Filter dropdown values, cached until an update is posted or removed
+        unique_authors = get_cached_update_authors()
+        processes = get_cached_update_processes()
 
-        # Cache processes with optimized logic
-        cache_key_processes = "updates_page_processes"
-        if cache_key_processes not in _cache or current_time - _cache[cache_key_processes][0] >= 300:
-            processes = [row[0] for row in db.session.query(Update.process).filter(Update.process.isnot(None)).distinct().all()]
-            _cache[cache_key_processes] = (current_time, processes)
-        else:
-            processes = _cache[cache_key_processes][1]
-
-        # Cache weekly updates count with optimized logic
-        cache_key_weekly = "updates_weekly_count"
-        if cache_key_weekly not in _cache or current_time - _cache[cache_key_weekly][0] >= 60:
-            week_ago = get_hours_ago(24 * 7)
-            updates_this_week = Update.query.filter(Update.timestamp >= week_ago).count()
-            _cache[cache_key_weekly] = (current_time, updates_this_week)
-        else:
-            updates_this_week = _cache[cache_key_weekly][1]
+        updates_this_week = get_cached_updates_this_week()
 
         # Get unique departments (consistent with other forms)
         departments = ["ABC", "XYZ", "AB"]
@@ -1322,7 +1561,6 @@ def create_app(config_name=None):
 
         if request.method == "POST":
             # Validate connection before critical operation
-            from database import validate_connection_before_operation
             if not validate_connection_before_operation():
                 flash("⚠️ Database connection issue. Please try again.")
                 return redirect(url_for("post_update"))
@@ -1345,6 +1583,7 @@ def create_app(config_name=None):
             try:
                 db.session.add(new_update)
                 db.session.commit()
+                invalidate_update_caches()
                 flash("✅ Update posted.")
 
                 # Log activity
@@ -1363,7 +1602,7 @@ def create_app(config_name=None):
     @app.route("/edit/<update_id>", methods=["GET", "POST"])
     @writer_required
     def edit_update(update_id):
-        update = Update.query.get(update_id)
+        update = db.session.get(Update, update_id)
         current = inject_current_user()["current_user"]
         if not update or update.name != current.display_name:
             flash("🚫 Unauthorized or not found.")
@@ -1378,6 +1617,7 @@ def create_app(config_name=None):
             update.timestamp = now_utc()
             try:
                 db.session.commit()
+                invalidate_update_caches()
                 flash("✏️ Update edited successfully.")
 
                 # Log activity
@@ -1393,24 +1633,22 @@ def create_app(config_name=None):
     @app.route("/view/<update_id>")
     def view_update(update_id):
         """View a specific update"""
-        update = Update.query.get(update_id)
+        update = db.session.get(Update, update_id)
         if not update:
             flash("🚫 Update not found.")
             return redirect(url_for("show_updates"))
         
-        # Get read count for this update
-        read_count = db.session.query(func.count(ReadLog.id)).filter(
-            ReadLog.update_id == update_id
-        ).scalar()
-
-        # Check if current user has read this update
-        is_read = False
-        if session.get("user_id"):
-            read_log = ReadLog.query.filter_by(
-                update_id=update_id,
-                user_id=session["user_id"]
-            ).first()
-            is_read = read_log is not None
+        # Read count and whether the current user is among the readers, in
+        # one pass over this update's read logs (max(case) rather than
+        # bool_or so SQLite can run it too). Anonymous viewers are never
+        # "read": user_id == None would compile to IS NULL and match guests
+        user_id = session.get("user_id")
+        read_flag = func.max(case((ReadLog.user_id == user_id, 1), else_=0)) if user_id else literal(0)
+        read_count, is_read = db.session.query(
+            func.count(ReadLog.id),
+            read_flag
+        ).filter(ReadLog.update_id == update_id).one()
+        is_read = bool(is_read)
         
         return render_template("view_update.html", 
                              app_name=app.config["APP_NAME"], 
@@ -1421,7 +1659,7 @@ def create_app(config_name=None):
     @app.route("/delete/<update_id>", methods=["POST"])
     @login_required
     def delete_update(update_id):
-        update = Update.query.get(update_id)
+        update = db.session.get(Update, update_id)
         current = inject_current_user()["current_user"]
         
         # Prepare response data
@@ -1439,9 +1677,10 @@ def create_app(config_name=None):
 
             try:
                 # Archive the update before deletion
-                if archive_update(update):
+                if archive_item(ArchivedUpdate, update, 'update'):
                     db.session.delete(update)
                     db.session.commit()
+                    invalidate_update_caches()
                     response["success"] = True
                     response["message"] = "✅ Update deleted and archived."
                     status_code = 200
@@ -1473,7 +1712,7 @@ def create_app(config_name=None):
             username = request.form["username"].strip().replace(" ", "_").lower()
             password = request.form["password"]
 
-            if not re.match("^[A-Za-z0-9_]+$", username):
+            if not _USERNAME_RE.match(username):
                 flash("🚫 Username can only contain letters, numbers, and underscores.")
                 return redirect(url_for("register"))
 
@@ -1481,7 +1720,7 @@ def create_app(config_name=None):
                 flash("⚠️ All fields required.")
                 return redirect(url_for("register"))
 
-            if User.query.filter_by(username=username).first():
+            if db.session.query(exists().where(User.username == username)).scalar():
                 flash("🚫 Username taken.")
                 return redirect(url_for("register"))
 
@@ -1516,7 +1755,6 @@ def create_app(config_name=None):
                     # Check if it's a full URL (from role decorators)
                     if next_page.startswith('http') or next_page.startswith('/'):
                         # Validate that it's a safe redirect within our app
-                        from urllib.parse import urlparse
                         parsed = urlparse(next_page)
                         if not parsed.netloc or parsed.netloc == request.host:
                             return redirect(next_page)
@@ -1561,11 +1799,11 @@ def create_app(config_name=None):
     def api_latest_update_time():
         """API endpoint to get the timestamp of the most recent update - optimized"""
         try:
-            # Use cached recent updates for better performance
-            recent_updates = get_cached_recent_updates(1)
-            if recent_updates:
+            # max(timestamp) from the timestamp index, cached for 2 seconds
+            latest_timestamp = get_cached_latest_update_time()
+            if latest_timestamp:
                 result = {
-                    "latest_timestamp": recent_updates[0]['timestamp'].isoformat(),
+                    "latest_timestamp": latest_timestamp.isoformat(),
                     "success": True
                 }
             else:
@@ -1595,13 +1833,13 @@ def create_app(config_name=None):
         except (ValueError, TypeError):
             page = 1
             per_page = 20
-        offset = (page - 1) * per_page
+        after_ts, after_id = parse_page_cursor(request.args)
 
         # Get paginated results
-        paginated_sops = SOPSummary.query.order_by(SOPSummary.created_at.desc()).offset(offset).limit(per_page).all()
+        paginated_sops, has_next = seek_page(SOPSummary, page, per_page, after_ts, after_id)
 
         # Get total count for pagination
-        total_sops = SOPSummary.query.count()
+        total_sops = get_cached_row_count(SOPSummary, SOP_COUNT_CACHE_KEY)
         total_pages = (total_sops + per_page - 1) // per_page
 
         return render_template("sop_summaries.html",
@@ -1610,7 +1848,8 @@ def create_app(config_name=None):
                              per_page=per_page,
                              total_sops=total_sops,
                              total_pages=total_pages,
-                             has_next=page < total_pages,
+                             has_next=has_next,
+                             next_cursor=page_cursor(paginated_sops) if has_next else {},
                              has_prev=page > 1)
 
     @app.route("/sop_summaries/add", methods=["GET", "POST"])
@@ -1626,17 +1865,22 @@ def create_app(config_name=None):
                 flash("Title and Summary are required.")
                 return redirect(url_for("add_sop_summary"))
 
-            tags_list = [tag.strip() for tag in tags.split(",")] if tags else []
+            if len(tags) > MAX_TAGS_LENGTH:
+                flash(f"Tags must be at most {MAX_TAGS_LENGTH} characters.")
+                return redirect(url_for("add_sop_summary"))
+
+            tags_list = parse_tags(tags)
 
             sop = SOPSummary(
                 title=title,
                 summary_text=summary_text,
                 department=department or None,
-                tags=tags_list or None,
+                tags=tags_list,
             )
             try:
                 db.session.add(sop)
                 db.session.commit()
+                _cache.delete(SOP_COUNT_CACHE_KEY)
                 flash("SOP Summary added successfully.")
 
                 # Log activity
@@ -1655,7 +1899,7 @@ def create_app(config_name=None):
     @app.route("/sop_summaries/edit/<int:sop_id>", methods=["GET", "POST"])
     @admin_required
     def edit_sop_summary(sop_id):
-        sop = SOPSummary.query.get(sop_id)
+        sop = db.session.get(SOPSummary, sop_id)
         if not sop:
             flash("SOP Summary not found.")
             return redirect(url_for("list_sop_summaries"))
@@ -1670,12 +1914,16 @@ def create_app(config_name=None):
                 flash("Title and Summary are required.")
                 return redirect(url_for("edit_sop_summary", sop_id=sop_id))
 
-            tags_list = [tag.strip() for tag in tags.split(",")] if tags else []
+            if len(tags) > MAX_TAGS_LENGTH:
+                flash(f"Tags must be at most {MAX_TAGS_LENGTH} characters.")
+                return redirect(url_for("edit_sop_summary", sop_id=sop_id))
+
+            tags_list = parse_tags(tags)
 
             sop.title = title
             sop.summary_text = summary_text
             sop.department = department or None
-            sop.tags = tags_list or None
+            sop.tags = tags_list
             try:
                 db.session.commit()
                 flash("✅ SOP Summary updated successfully.")
@@ -1700,7 +1948,8 @@ def create_app(config_name=None):
     @app.route("/sop_summaries/delete/<int:sop_id>", methods=["POST"])
     @delete_required
     def delete_sop_summary(sop_id):
-        sop = SOPSummary.query.get(sop_id)
+        # Archiving copies the row in SQL, so only the title is needed here
+        sop = db.session.get(SOPSummary, sop_id, options=[load_only(SOPSummary.id, SOPSummary.title)])
         if not sop:
             flash("⚠️ SOP Summary not found.")
             return redirect(url_for("list_sop_summaries"))
@@ -1710,9 +1959,10 @@ def create_app(config_name=None):
 
         try:
             # Archive the SOP before deletion
-            if archive_sop(sop):
+            if archive_item(ArchivedSOPSummary, sop, 'SOP'):
                 db.session.delete(sop)
                 db.session.commit()
+                _cache.delete(SOP_COUNT_CACHE_KEY)
                 flash("✅ SOP Summary deleted and archived.")
 
                 # Log activity after successful deletion
@@ -1739,13 +1989,13 @@ def create_app(config_name=None):
         except (ValueError, TypeError):
             page = 1
             per_page = 20
-        offset = (page - 1) * per_page
+        after_ts, after_id = parse_page_cursor(request.args)
 
         # Get paginated results
-        paginated_lessons = LessonLearned.query.order_by(LessonLearned.created_at.desc()).offset(offset).limit(per_page).all()
+        paginated_lessons, has_next = seek_page(LessonLearned, page, per_page, after_ts, after_id)
 
         # Get total count for pagination
-        total_lessons = LessonLearned.query.count()
+        total_lessons = get_cached_row_count(LessonLearned, LESSON_COUNT_CACHE_KEY)
         total_pages = (total_lessons + per_page - 1) // per_page
 
         return render_template("lessons_learned.html",
@@ -1754,7 +2004,8 @@ def create_app(config_name=None):
                              per_page=per_page,
                              total_lessons=total_lessons,
                              total_pages=total_pages,
-                             has_next=page < total_pages,
+                             has_next=has_next,
+                             next_cursor=page_cursor(paginated_lessons) if has_next else {},
                              has_prev=page > 1)
 
     @app.route("/lessons_learned/add", methods=["GET", "POST"])
@@ -1772,7 +2023,11 @@ def create_app(config_name=None):
                 flash("Title and Content are required.")
                 return redirect(url_for("add_lesson_learned"))
 
-            tags_list = [tag.strip() for tag in tags.split(",")] if tags else []
+            if len(tags) > MAX_TAGS_LENGTH:
+                flash(f"Tags must be at most {MAX_TAGS_LENGTH} characters.")
+                return redirect(url_for("add_lesson_learned"))
+
+            tags_list = parse_tags(tags)
 
             lesson = LessonLearned(
                 title=title,
@@ -1780,11 +2035,12 @@ def create_app(config_name=None):
                 summary=summary or None,
                 author=author or None,
                 department=department or None,
-                tags=tags_list or None,
+                tags=tags_list,
             )
             try:
                 db.session.add(lesson)
                 db.session.commit()
+                _cache.delete(LESSON_COUNT_CACHE_KEY)
                 flash("Lesson Learned added successfully.")
 
                 # Log activity
@@ -1803,7 +2059,7 @@ def create_app(config_name=None):
     @app.route("/lessons_learned/edit/<int:lesson_id>", methods=["GET", "POST"])
     @admin_required
     def edit_lesson_learned(lesson_id):
-        lesson = LessonLearned.query.get(lesson_id)
+        lesson = db.session.get(LessonLearned, lesson_id)
         if not lesson:
             flash("Lesson Learned not found.")
             return redirect(url_for("list_lessons_learned"))
@@ -1820,14 +2076,18 @@ def create_app(config_name=None):
                 flash("Title and Content are required.")
                 return redirect(url_for("edit_lesson_learned", lesson_id=lesson_id))
 
-            tags_list = [tag.strip() for tag in tags.split(",")] if tags else []
+            if len(tags) > MAX_TAGS_LENGTH:
+                flash(f"Tags must be at most {MAX_TAGS_LENGTH} characters.")
+                return redirect(url_for("edit_lesson_learned", lesson_id=lesson_id))
+
+            tags_list = parse_tags(tags)
 
             lesson.title = title
             lesson.content = content
             lesson.summary = summary or None
             lesson.author = author or None
             lesson.department = department or None
-            lesson.tags = tags_list or None
+            lesson.tags = tags_list
 
             try:
                 db.session.commit()
@@ -1853,7 +2113,8 @@ def create_app(config_name=None):
     @app.route("/lessons_learned/delete/<int:lesson_id>", methods=["POST"])
     @admin_required
     def delete_lesson_learned(lesson_id):
-        lesson = LessonLearned.query.get(lesson_id)
+        # Archiving copies the row in SQL, so only the title is needed here
+        lesson = db.session.get(LessonLearned, lesson_id, options=[load_only(LessonLearned.id, LessonLearned.title)])
         if not lesson:
             flash("Lesson Learned not found.")
             return redirect(url_for("list_lessons_learned"))
@@ -1863,9 +2124,10 @@ def create_app(config_name=None):
 
         try:
             # Archive the lesson before deletion
-            if archive_lesson(lesson):
+            if archive_item(ArchivedLessonLearned, lesson, 'lesson'):
                 db.session.delete(lesson)
                 db.session.commit()
+                _cache.delete(LESSON_COUNT_CACHE_KEY)
                 flash("✅ Lesson Learned deleted and archived.")
 
                 # Log activity after successful deletion
@@ -1885,7 +2147,7 @@ def create_app(config_name=None):
     @app.route("/sop_summaries/<int:summary_id>")
     @login_required
     def view_sop_summary(summary_id):
-        summary = SOPSummary.query.get(summary_id)
+        summary = db.session.get(SOPSummary, summary_id)
         if not summary:
             flash("\u26a0\ufe0f SOP Summary not found.")
             return redirect(url_for("list_sop_summaries"))
@@ -1902,17 +2164,20 @@ def create_app(config_name=None):
     def check_update(update_id):
         """Check if an update exists and is accessible."""
         try:
-            update = Update.query.get(update_id)
-            if not update:
+            found = db.session.query(exists().where(Update.id == update_id)).scalar()
+            if not found:
                 return jsonify({
                     'error': 'Not Found',
                     'message': 'Update not found'
                 }), 404
-            return jsonify({
+            response = jsonify({
                 'exists': True,
-                'id': update.id,
+                'id': update_id,
                 'status': 'active'
             })
+            # Existence rarely changes; let the browser reuse the answer briefly
+            response.headers['Cache-Control'] = 'private, max-age=30'
+            return response
         except Exception as e:
             logger.error(f"Error checking update {update_id}: {str(e)}")
             return jsonify({
@@ -1988,7 +2253,7 @@ def create_app(config_name=None):
         """Mark a lesson learned as read for the current user."""
         try:
             # Check if lesson exists
-            lesson = LessonLearned.query.get(lesson_id)
+            lesson = db.session.get(LessonLearned, lesson_id)
             if not lesson:
                 return jsonify({
                     "success": False,
@@ -2091,212 +2356,148 @@ def create_app(config_name=None):
             return render_template("export_readlogs.html", app_name=app.config["APP_NAME"])
 
         try:
-            from openpyxl import Workbook
-            from io import BytesIO
-
-            # Create Excel workbook with minimal formatting for faster export
-            wb = Workbook()
-
-            # Remove default sheet
-            wb.remove(wb.active)
-
-            # Sheet 1: Update Read Logs
-            ws_update_readlogs = wb.create_sheet("Update Read Logs")
-            ws_update_readlogs.column_dimensions['A'].width = 10
-            ws_update_readlogs.column_dimensions['B'].width = 10
-            ws_update_readlogs.column_dimensions['C'].width = 15
-            ws_update_readlogs.column_dimensions['D'].width = 30
-            ws_update_readlogs.column_dimensions['E'].width = 20
-            ws_update_readlogs.column_dimensions['F'].width = 15
-            ws_update_readlogs.column_dimensions['G'].width = 50
-            ws_update_readlogs.column_dimensions['H'].width = 50
-            ws_update_readlogs.column_dimensions['I'].width = 20
-            ws_update_readlogs.column_dimensions['J'].width = 20
-            ws_update_readlogs.column_dimensions['K'].width = 30
-
-            ws_update_readlogs.append([
-                'Read ID', 'Update ID', 'Reader Type', 'Reader Name', 'Read Time (IST)',
-                'IP Address', 'User Agent', 'Update Content', 'Process', 'Update Time (IST)', 'Reader Email'
-            ])
-
-            # Sheet 2: Lesson Read Logs
-            ws_lesson_readlogs = wb.create_sheet("Lesson Read Logs")
-            ws_lesson_readlogs.column_dimensions['A'].width = 10
-            ws_lesson_readlogs.column_dimensions['B'].width = 10
-            ws_lesson_readlogs.column_dimensions['C'].width = 15
-            ws_lesson_readlogs.column_dimensions['D'].width = 30
-            ws_lesson_readlogs.column_dimensions['E'].width = 20
-            ws_lesson_readlogs.column_dimensions['F'].width = 15
-            ws_lesson_readlogs.column_dimensions['G'].width = 50
-            ws_lesson_readlogs.column_dimensions['H'].width = 50
-            ws_lesson_readlogs.column_dimensions['I'].width = 20
-            ws_lesson_readlogs.column_dimensions['J'].width = 20
-            ws_lesson_readlogs.column_dimensions['K'].width = 30
-
-            ws_lesson_readlogs.append([
-                'Read ID', 'Lesson ID', 'Reader Type', 'Reader Name', 'Read Time (IST)',
-                'IP Address', 'User Agent', 'Lesson Content', 'Department', 'Lesson Time (IST)', 'Reader Email'
-            ])
-
-            # Get read logs data with user information for updates and lessons
-            with app.app_context():
-                try:
-                    # Try to query new separate tables first
-                    update_read_logs = db.session.query(
-                        ReadLog.id,
-                        ReadLog.update_id,
-                        ReadLog.user_id,
-                        ReadLog.guest_name,
-                        ReadLog.timestamp,
-                        ReadLog.ip_address,
-                        ReadLog.user_agent,
-                        Update.name.label('update_name'),
-                        Update.message.label('update_message'),
-                        Update.process,
-                        Update.timestamp.label('update_timestamp'),
-                        User.email.label('user_email'),
-                        User.display_name.label('user_display_name')
-                    ).join(
-                        Update, ReadLog.update_id == Update.id
-                    ).outerjoin(
-                        User, ReadLog.user_id == User.id
-                    ).order_by(
-                        ReadLog.timestamp.desc()
-                    ).all()
-
-                    lesson_read_logs = db.session.query(
-                        LessonReadLog.id,
-                        LessonReadLog.lesson_id,
-                        LessonReadLog.user_id,
-                        LessonReadLog.guest_name,
-                        LessonReadLog.timestamp,
-                        LessonReadLog.ip_address,
-                        LessonReadLog.user_agent,
-                        LessonLearned.title.label('lesson_title'),
-                        LessonLearned.content.label('lesson_content'),
-                        LessonLearned.department.label('department'),
-                        LessonLearned.created_at.label('lesson_timestamp'),
-                        User.email.label('user_email'),
-                        User.display_name.label('user_display_name')
-                    ).join(
-                        LessonLearned, LessonReadLog.lesson_id == LessonLearned.id
-                    ).outerjoin(
-                        User, LessonReadLog.user_id == User.id
-                    ).order_by(
-                        LessonReadLog.timestamp.desc()
-                    ).all()
-
-                except Exception as e:
-                    logger.warning(f"New read log tables not available, falling back to legacy table: {e}")
-                    # Fallback to legacy read_logs table
-                    update_read_logs = []
-                    lesson_read_logs = []
-
-                    # Since we separated the tables, we should not use the legacy fallback
-                    # The new tables are already being used above, so this fallback should not be reached
-                    # But if it is, we'll create empty lists
-                    legacy_logs = []
-
-                    # Separate into update and lesson logs
-                    for log in legacy_logs:
-                        if log.update_id:
-                            update_read_logs.append(log)
-                        elif hasattr(log, 'lesson_id') and log.lesson_id:
-                            lesson_read_logs.append(log)
-
-            # Process update read logs
-            for log in update_read_logs:
-                try:
-                    reader_type = 'Registered' if log.user_id else 'Guest'
-                    reader_name = log.user_display_name if log.user_id else (log.guest_name or 'Anonymous Guest')
-                    ist_timestamp = format_ist(log.timestamp, '%Y-%m-%d %H:%M:%S')
-                    content_ist_timestamp = format_ist(log.update_timestamp, '%Y-%m-%d %H:%M:%S')
+            # Write the workbook to a temp file so the export is streamed
+            # from disk instead of being held in memory as one buffer
+            export_file = tempfile.NamedTemporaryFile(suffix='.xlsx', delete=False)
+            export_file.close()
 
-                    # Combine content name and message for better context
-                    content_content = f"{log.update_name}\n{log.update_message[:200]}..."
-
-                    # Format user agent for readability
-                    user_agent = log.user_agent or ''
-                    if len(user_agent) > 100:
-                        user_agent = user_agent[:97] + "..."
-
-                    row = [
-                        log.id,
-                        log.update_id,
-                        reader_type,
-                        reader_name,
-                        ist_timestamp,
-                        log.ip_address or 'N/A',
-                        user_agent,
-                        content_content,
-                        log.process or 'N/A',
-                        content_ist_timestamp,
-                        log.user_email if log.user_id else 'N/A'
-                    ]
-
-                    ws_update_readlogs.append(row)
-                except Exception as row_error:
-                    logger.error(f"Error processing update read log entry {log.id}: {str(row_error)}")
-                    continue
-
-            # Process lesson read logs
-            for log in lesson_read_logs:
+            @after_this_request
+            def remove_export_file(response):
                 try:
-                    reader_type = 'Registered' if log.user_id else 'Guest'
-                    reader_name = log.user_display_name if log.user_id else (log.guest_name or 'Anonymous Guest')
-                    ist_timestamp = format_ist(log.timestamp, '%Y-%m-%d %H:%M:%S')
-                    content_ist_timestamp = format_ist(log.lesson_timestamp, '%Y-%m-%d %H:%M:%S')
-
-                    # Combine content name and message for better context
-                    content_content = f"{log.lesson_title}\n{log.lesson_content[:200]}..."
+                    os.unlink(export_file.name)
+                except OSError:
+                    pass
+                return response
+
+            # Rows are flushed to disk as they are appended; the .xlsx is
+            # written when the block exits, and the spooled sheets are
+            # discarded if building it fails
+            with StreamingWorkbook(export_file.name) as wb:
+                # Sheet 1: Update Read Logs
+                ws_update_readlogs = wb.add_sheet(
+                    "Update Read Logs", widths=[10, 10, 15, 30, 20, 15, 50, 50, 20, 20, 30]
+                )
 
-                    # Format user agent for readability
-                    user_agent = log.user_agent or ''
-                    if len(user_agent) > 100:
-                        user_agent = user_agent[:97] + "..."
+                ws_update_readlogs.append([
+                    'Read ID', 'Update ID', 'Reader Type', 'Reader Name', 'Read Time (IST)',
+                    'IP Address', 'User Agent', 'Update Content', 'Process', 'Update Time (IST)', 'Reader Email'
+                ])
 
-                    row = [
-                        log.id,
-                        log.lesson_id,
-                        reader_type,
-                        reader_name,
-                        ist_timestamp,
-                        log.ip_address or 'N/A',
-                        user_agent,
-                        content_content,
-                        log.department or 'N/A',
-                        content_ist_timestamp,
-                        log.user_email if log.user_id else 'N/A'
-                    ]
+                # Sheet 2: Lesson Read Logs
+                ws_lesson_readlogs = wb.add_sheet(
+                    "Lesson Read Logs", widths=[10, 10, 15, 30, 20, 15, 50, 50, 20, 20, 30]
+                )
 
-                    ws_lesson_readlogs.append(row)
-                except Exception as row_error:
-                    logger.error(f"Error processing lesson read log entry {log.id}: {str(row_error)}")
-                    continue
-
-            # Sheet 2: Activity Logs - Simplified
-            ws_activity = wb.create_sheet("Activity Logs")
-            ws_activity.append([
-                'Activity ID', 'User', 'Action', 'Entity Type', 'Entity Title',
-                'Timestamp (IST)', 'IP Address', 'User Agent', 'Details'
-            ])
-
-            # Sheet 3: Registered Users
-            ws_users = wb.create_sheet("Registered Users")
-            ws_users.column_dimensions['A'].width = 10
-            ws_users.column_dimensions['B'].width = 20
-            ws_users.column_dimensions['C'].width = 30
-            ws_users.column_dimensions['D'].width = 40
-            ws_users.column_dimensions['E'].width = 15
-            ws_users.column_dimensions['F'].width = 25
-
-            ws_users.append([
-                'User ID', 'Username', 'Display Name', 'Email', 'Role', 'Registration Date (IST)'
-            ])
-
-            # Get activity logs
-            with app.app_context():
-                activity_logs = db.session.query(
+                ws_lesson_readlogs.append([
+                    'Read ID', 'Lesson ID', 'Reader Type', 'Reader Name', 'Read Time (IST)',
+                    'IP Address', 'User Agent', 'Lesson Content', 'Department', 'Lesson Time (IST)', 'Reader Email'
+                ])
+
+                # Read logs with user information for updates and lessons, as
+                # plain column rows fetched 1000 at a time (server-side cursor on
+                # PostgreSQL) instead of loading every row
+                update_read_logs = db.session.execute(select(
+                    ReadLog.id,
+                    ReadLog.update_id,
+                    ReadLog.user_id,
+                    ReadLog.guest_name,
+                    ReadLog.timestamp,
+                    ReadLog.ip_address,
+                    # 101 chars is enough to tell whether to add "..." below
+                    func.substr(ReadLog.user_agent, 1, 101).label('user_agent'),
+                    Update.name.label('update_name'),
+                    func.substr(Update.message, 1, 200).label('update_message'),
+                    Update.process,
+                    Update.timestamp.label('update_timestamp'),
+                    User.email.label('user_email'),
+                    User.display_name.label('user_display_name')
+                ).join(
+                    Update, ReadLog.update_id == Update.id
+                ).outerjoin(
+                    User, ReadLog.user_id == User.id
+                ).order_by(
+                    ReadLog.timestamp.desc()
+                ).execution_options(yield_per=1000))
+
+                lesson_read_logs = db.session.execute(select(
+                    LessonReadLog.id,
+                    LessonReadLog.lesson_id,
+                    LessonReadLog.user_id,
+                    LessonReadLog.guest_name,
+                    LessonReadLog.timestamp,
+                    LessonReadLog.ip_address,
+                    func.substr(LessonReadLog.user_agent, 1, 101).label('user_agent'),
+                    LessonLearned.title.label('lesson_title'),
+                    func.substr(LessonLearned.content, 1, 200).label('lesson_content'),
+                    LessonLearned.department.label('department'),
+                    LessonLearned.created_at.label('lesson_timestamp'),
+                    User.email.label('user_email'),
+                    User.display_name.label('user_display_name')
+                ).join(
+                    LessonLearned, LessonReadLog.lesson_id == LessonLearned.id
+                ).outerjoin(
+                    User, LessonReadLog.user_id == User.id
+                ).order_by(
+                    LessonReadLog.timestamp.desc()
+                ).execution_options(yield_per=1000))
+
+                def read_log_rows(logs, item_id, title, body, category, item_timestamp, label):
+                    # Yields one sheet row per read log; rows that fail to format
+                    # are logged and skipped
+                    for log in logs:
+                        try:
+                            reader_type = 'Registered' if log.user_id else 'Guest'
+                            reader_name = log.user_display_name if log.user_id else (log.guest_name or 'Anonymous Guest')
+
+                            # Format user agent for readability
+                            user_agent = log.user_agent or ''
+                            if len(user_agent) > 100:
+                                user_agent = user_agent[:97] + "..."
+
+                            yield [
+                                log.id,
+                                getattr(log, item_id),
+                                reader_type,
+                                reader_name,
+                                format_ist(log.timestamp, '%Y-%m-%d %H:%M:%S'),
+                                log.ip_address or 'N/A',
+                                user_agent,
+                                # Combine content name and message for better context
+                                f"{getattr(log, title)}\n{getattr(log, body)}...",
+                                getattr(log, category) or 'N/A',
+                                format_ist(getattr(log, item_timestamp), '%Y-%m-%d %H:%M:%S'),
+                                log.user_email if log.user_id else 'N/A'
+                            ]
+                        except Exception as row_error:
+                            logger.error(f"Error processing {label} read log entry {log.id}: {str(row_error)}")
+                            continue
+
+                ws_update_readlogs.append_rows(read_log_rows(
+                    update_read_logs, 'update_id', 'update_name', 'update_message',
+                    'process', 'update_timestamp', 'update'
+                ))
+                ws_lesson_readlogs.append_rows(read_log_rows(
+                    lesson_read_logs, 'lesson_id', 'lesson_title', 'lesson_content',
+                    'department', 'lesson_timestamp', 'lesson'
+                ))
+
+                # Sheet 2: Activity Logs - Simplified
+                ws_activity = wb.add_sheet("Activity Logs")
+                ws_activity.append([
+                    'Activity ID', 'User', 'Action', 'Entity Type', 'Entity Title',
+                    'Timestamp (IST)', 'IP Address', 'User Agent', 'Details'
+                ])
+
+                # Sheet 3: Registered Users
+                ws_users = wb.add_sheet("Registered Users", widths=[10, 20, 30, 40, 15, 25])
+
+                ws_users.append([
+                    'User ID', 'Username', 'Display Name', 'Email', 'Role', 'Registration Date (IST)'
+                ])
+
+                # Get activity logs, streamed in batches (server-side cursor on
+                # PostgreSQL) instead of materializing the whole result
+                activity_logs_stmt = select(
                     ActivityLog.id,
                     ActivityLog.user_id,
                     ActivityLog.action,
@@ -2304,444 +2505,269 @@ def create_app(config_name=None):
                     ActivityLog.entity_title,
                     ActivityLog.timestamp,
                     ActivityLog.ip_address,
-                    ActivityLog.user_agent,
+                    func.substr(ActivityLog.user_agent, 1, 100).label('user_agent'),
                     ActivityLog.details,
                     User.display_name.label('user_name')
                 ).outerjoin(
                     User, ActivityLog.user_id == User.id
                 ).order_by(
                     ActivityLog.timestamp.desc()
-                ).limit(5000).all()  # Limit for performance
-
-            for log in activity_logs:
-                try:
-                    ist_timestamp = format_ist(log.timestamp, '%Y-%m-%d %H:%M:%S')
-                    user_name = log.user_name if log.user_name else 'System'
-
-                    ws_activity.append([
-                        log.id,
-                        user_name,
-                        log.action,
-                        log.entity_type,
-                        log.entity_title or '',
-                        ist_timestamp,
-                        log.ip_address or '',
-                        (log.user_agent or '')[:100],
-                        log.details or ''
-                    ])
-                except Exception as row_error:
-                    logger.error(f"Error processing activity log entry {log.id}: {str(row_error)}")
-                    continue
-
-            # Process users data for Registered Users sheet
-            users = User.query.order_by(User.created_at.desc()).all()
-            for user in users:
-                try:
-                    ist_registration_date = format_ist(user.created_at, '%Y-%m-%d %H:%M:%S')
-
-                    row = [
-                        user.id,
-                        user.username,
-                        user.display_name,
-                        user.email or 'N/A',
-                        user.role,
-                        ist_registration_date
-                    ]
+                )
 
-                    ws_users.append(row)
-                except Exception as user_error:
-                    logger.error(f"Error processing user {user.id}: {str(user_error)}")
-                    continue
+                activity_logs = db.session.execute(
+                    activity_logs_stmt.execution_options(yield_per=1000)
+                )
 
-            # Sheet 5: Summary Analytics - Simplified
-            ws_analytics = wb.create_sheet("Summary Analytics")
-            ws_analytics.append(['Metric', 'Value'])
+                def activity_log_rows(logs):
+                    for log in logs:
+                        try:
+                            yield [
+                                log.id,
+                                log.user_name if log.user_name else 'System',
+                                log.action,
+                                log.entity_type,
+                                log.entity_title or '',
+                                format_ist(log.timestamp, '%Y-%m-%d %H:%M:%S'),
+                                log.ip_address or '',
+                                log.user_agent or '',
+                                log.details or ''
+                            ]
+                        except Exception as row_error:
+                            logger.error(f"Error processing activity log entry {log.id}: {str(row_error)}")
+                            continue
+
+                ws_activity.append_rows(activity_log_rows(activity_logs))
+
+                # Process users data for Registered Users sheet
+                users = User.query.order_by(User.created_at.desc()).all()
+                for user in users:
+                    try:
+                        ist_registration_date = format_ist(user.created_at, '%Y-%m-%d %H:%M:%S')
 
-            with app.app_context():
-                try:
-                    # Try new tables first
-                    total_update_reads = db.session.query(func.count(ReadLog.id)).scalar()
-                    total_lesson_reads = db.session.query(func.count(LessonReadLog.id)).scalar()
-                    total_reads = total_update_reads + total_lesson_reads
-
-                    # Unique readers (registered users)
-                    unique_registered_updates = db.session.query(func.count(func.distinct(ReadLog.user_id))).filter(
-                        ReadLog.user_id.isnot(None)
-                    ).scalar()
-                    unique_registered_lessons = db.session.query(func.count(func.distinct(LessonReadLog.user_id))).filter(
-                        LessonReadLog.user_id.isnot(None)
-                    ).scalar()
-                    unique_registered = max(unique_registered_updates or 0, unique_registered_lessons or 0)
-
-                    # Unique guest readers
-                    unique_guests_updates = db.session.query(func.count(func.distinct(ReadLog.guest_name))).filter(
-                        ReadLog.user_id.is_(None)
-                    ).scalar()
-                    unique_guests_lessons = db.session.query(func.count(func.distinct(LessonReadLog.guest_name))).filter(
-                        LessonReadLog.user_id.is_(None)
-                    ).scalar()
-                    unique_guests = (unique_guests_updates or 0) + (unique_guests_lessons or 0)
-
-                    # Total registered vs guest reads
-                    registered_reads = (db.session.query(func.count(ReadLog.id)).filter(
-                        ReadLog.user_id.isnot(None)
-                    ).scalar() or 0) + (db.session.query(func.count(LessonReadLog.id)).filter(
-                        LessonReadLog.user_id.isnot(None)
-                    ).scalar() or 0)
-
-                    guest_reads = (db.session.query(func.count(ReadLog.id)).filter(
-                        ReadLog.user_id.is_(None)
-                    ).scalar() or 0) + (db.session.query(func.count(LessonReadLog.id)).filter(
-                        LessonReadLog.user_id.is_(None)
-                    ).scalar() or 0)
-
-                except Exception as e:
-                    logger.warning(f"New read log tables not available for analytics, using legacy table: {e}")
-                    # Fallback to legacy read_logs table - tables are separated now, this should not be reached
-                    total_reads = 0
-
-                    unique_registered = db.session.query(func.count(func.distinct(ReadLog.user_id))).filter(
-                        ReadLog.user_id.isnot(None)
-                    ).scalar()
-
-                    unique_guests = db.session.query(func.count(func.distinct(ReadLog.guest_name))).filter(
-                        ReadLog.user_id.is_(None)
-                    ).scalar()
-
-                    registered_reads = db.session.query(func.count(ReadLog.id)).filter(
-                        ReadLog.user_id.isnot(None)
-                    ).scalar()
-
-                    guest_reads = db.session.query(func.count(ReadLog.id)).filter(
-                        ReadLog.user_id.is_(None)
-                    ).scalar()
+                        row = [
+                            user.id,
+                            user.username,
+                            user.display_name,
+                            user.email or 'N/A',
+                            user.role,
+                            ist_registration_date
+                        ]
+
+                        ws_users.append(row)
+                    except Exception as user_error:
+                        logger.error(f"Error processing user {user.id}: {str(user_error)}")
+                        continue
+
+                # Sheet 5: Summary Analytics - Simplified
+                ws_analytics = wb.add_sheet("Summary Analytics")
+                ws_analytics.append(['Metric', 'Value'])
+
+                # Read totals per read-log table in one conditional-aggregate pass
+                # each: all reads, distinct users, distinct guests, user reads,
+                # guest reads
+                read_stats = {}
+                for log_model in (ReadLog, LessonReadLog):
+                    read_stats[log_model] = db.session.query(
+                        func.count(log_model.id),
+                        func.count(func.distinct(log_model.user_id)),
+                        func.count(func.distinct(case((log_model.user_id.is_(None), log_model.guest_name)))),
+                        func.count(log_model.user_id),
+                        func.count(case((log_model.user_id.is_(None), 1)))
+                    ).one()
+                update_stats, lesson_stats = read_stats[ReadLog], read_stats[LessonReadLog]
+
+                total_reads = update_stats[0] + lesson_stats[0]
+                unique_registered = max(update_stats[1], lesson_stats[1])
+                unique_guests = update_stats[2] + lesson_stats[2]
+                registered_reads = update_stats[3] + lesson_stats[3]
+                guest_reads = update_stats[4] + lesson_stats[4]
 
                 # Total updates and lessons
-                total_updates = db.session.query(func.count(Update.id)).scalar()
-                total_lessons = db.session.query(func.count(LessonLearned.id)).scalar()
-
-            analytics_data = [
-                ['Total Reads', total_reads or 0],
-                ['Unique Registered Readers', unique_registered or 0],
-                ['Unique Guest Readers', unique_guests or 0],
-                ['Registered User Reads', registered_reads or 0],
-                ['Guest User Reads', guest_reads or 0],
-                ['Total Updates', total_updates or 0],
-                ['Total Lessons Learned', total_lessons or 0]
-            ]
-
-            for row in analytics_data:
-                ws_analytics.append(row)
-
-            # Sheet 6: Top Performers
-            ws_performers = wb.create_sheet("Top Performers")
-
-            # Most active readers section - Simplified
-            ws_performers.append(['Most Active Readers'])
-            ws_performers.append(['Reader Name', 'Reader Type', 'Total Reads'])
-
-            with app.app_context():
-                try:
-                    # Top registered readers (both updates and lessons)
-                    top_registered_updates = db.session.query(
-                        User.display_name,
-                        func.count(ReadLog.id).label('read_count')
-                    ).join(
-                        ReadLog, User.id == ReadLog.user_id
-                    ).group_by(
-                        User.id, User.display_name
-                    ).all()
-
-                    top_registered_lessons = db.session.query(
-                        User.display_name,
-                        func.count(LessonReadLog.id).label('read_count')
-                    ).join(
-                        LessonReadLog, User.id == LessonReadLog.user_id
-                    ).group_by(
-                        User.id, User.display_name
-                    ).all()
-
-                    # Combine and aggregate
-                    from collections import defaultdict
-                    combined_registered = defaultdict(int)
-                    for name, count in top_registered_updates:
-                        combined_registered[name] += count
-                    for name, count in top_registered_lessons:
-                        combined_registered[name] += count
-
-                    top_registered = sorted(combined_registered.items(), key=lambda x: x[1], reverse=True)[:10]
-
-                    # Top guest readers (both updates and lessons)
-                    top_guests_updates = db.session.query(
-                        ReadLog.guest_name,
-                        func.count(ReadLog.id).label('read_count')
-                    ).filter(
-                        ReadLog.user_id.is_(None)
-                    ).group_by(
-                        ReadLog.guest_name
-                    ).all()
-
-                    top_guests_lessons = db.session.query(
-                        LessonReadLog.guest_name,
-                        func.count(LessonReadLog.id).label('read_count')
-                    ).filter(
-                        LessonReadLog.user_id.is_(None)
-                    ).group_by(
-                        LessonReadLog.guest_name
-                    ).all()
-
-                    # Combine and aggregate
-                    combined_guests = defaultdict(int)
-                    for name, count in top_guests_updates:
-                        if name: combined_guests[name] += count
-                    for name, count in top_guests_lessons:
-                        if name: combined_guests[name] += count
-
-                    top_guests = sorted(combined_guests.items(), key=lambda x: x[1], reverse=True)[:10]
-
-                except Exception as e:
-                    logger.warning(f"New read log tables not available for top performers, using legacy table: {e}")
-                    # Fallback to legacy read_logs table - tables are separated now, this should not be reached
-                    top_registered = db.session.query(
-                        User.display_name,
-                        func.count(ReadLog.id).label('read_count')
-                    ).join(
-                        ReadLog, User.id == ReadLog.user_id
-                    ).group_by(
-                        User.id, User.display_name
-                    ).order_by(
-                        func.count(ReadLog.id).desc()
-                    ).limit(10).all()
-
-                    top_guests = db.session.query(
-                        ReadLog.guest_name,
-                        func.count(ReadLog.id).label('read_count')
-                    ).filter(
-                        ReadLog.user_id.is_(None)
-                    ).group_by(
-                        ReadLog.guest_name
-                    ).order_by(
-                        func.count(ReadLog.id).desc()
-                    ).limit(10).all()
-
-            for reader, count in top_registered:
-                ws_performers.append([reader, 'Registered', count])
-
-            for reader, count in top_guests:
-                ws_performers.append([reader, 'Guest', count])
-
-            # Most popular updates section
-            ws_performers.append([])
-            ws_performers.append(['Most Popular Updates'])
-            ws_performers.append(['Update Title', 'Process', 'Total Reads'])
-
-            with app.app_context():
-                try:
-                    # Top updates
-                    top_updates = db.session.query(
-                        Update.name.label('title'),
-                        Update.process.label('category'),
-                        func.count(ReadLog.id).label('read_count'),
-                        db.literal('Update').label('content_type')
-                    ).outerjoin(
-                        ReadLog, Update.id == ReadLog.update_id
-                    ).group_by(
-                        Update.id, Update.name, Update.process
-                    ).all()
-
-                    # Top lessons
-                    top_lessons = db.session.query(
-                        LessonLearned.title.label('title'),
-                        LessonLearned.department.label('category'),
-                        func.count(LessonReadLog.id).label('read_count'),
-                        db.literal('Lesson').label('content_type')
-                    ).outerjoin(
-                        LessonReadLog, LessonLearned.id == LessonReadLog.lesson_id
-                    ).group_by(
-                        LessonLearned.id, LessonLearned.title, LessonLearned.department
-                    ).all()
-
-                    # Combine and get top 10
-                    top_content = sorted(
-                        [(title, category, count, content_type) for title, category, count, content_type in top_updates] +
-                        [(title, category, count, content_type) for title, category, count, content_type in top_lessons],
-                        key=lambda x: x[2], reverse=True
-                    )[:10]
-
-                except Exception as e:
-                    logger.warning(f"New read log tables not available for popular content, using legacy table: {e}")
-                    # Fallback to legacy read_logs table - tables are separated now, this should not be reached
-                    top_updates = db.session.query(
+                total_updates, total_lessons = db.session.query(
+                    select(func.count(Update.id)).scalar_subquery(),
+                    select(func.count(LessonLearned.id)).scalar_subquery()
+                ).one()
+
+                analytics_data = [
+                    ['Total Reads', total_reads or 0],
+                    ['Unique Registered Readers', unique_registered or 0],
+                    ['Unique Guest Readers', unique_guests or 0],
+                    ['Registered User Reads', registered_reads or 0],
+                    ['Guest User Reads', guest_reads or 0],
+                    ['Total Updates', total_updates or 0],
+                    ['Total Lessons Learned', total_lessons or 0]
+                ]
+
+                for row in analytics_data:
+                    ws_analytics.append(row)
+
+                # Sheet 6: Top Performers
+                ws_performers = wb.add_sheet("Top Performers")
+
+                # Most active readers section - Simplified
+                ws_performers.append(['Most Active Readers'])
+                ws_performers.append(['Reader Name', 'Reader Type', 'Total Reads'])
+
+                # Reads from both read-log tables are combined with UNION ALL and
+                # ranked in the database, so each list is one query returning at
+                # most 10 rows
+                registered_reads = union_all(
+                    select(ReadLog.user_id).where(ReadLog.user_id.isnot(None)),
+                    select(LessonReadLog.user_id).where(LessonReadLog.user_id.isnot(None))
+                ).subquery()
+                top_registered = db.session.query(
+                    User.display_name,
+                    func.count().label('read_count')
+                ).join(
+                    registered_reads, User.id == registered_reads.c.user_id
+                ).group_by(
+                    User.display_name
+                ).order_by(
+                    func.count().desc()
+                ).limit(10).all()
+
+                guest_reads = union_all(
+                    select(ReadLog.guest_name).where(ReadLog.user_id.is_(None)),
+                    select(LessonReadLog.guest_name).where(LessonReadLog.user_id.is_(None))
+                ).subquery()
+                top_guests = db.session.query(
+                    guest_reads.c.guest_name,
+                    func.count().label('read_count')
+                ).filter(
+                    guest_reads.c.guest_name.isnot(None),
+                    guest_reads.c.guest_name != ''
+                ).group_by(
+                    guest_reads.c.guest_name
+                ).order_by(
+                    func.count().desc()
+                ).limit(10).all()
+
+                for reader, count in top_registered:
+                    ws_performers.append([reader, 'Registered', count])
+
+                for reader, count in top_guests:
+                    ws_performers.append([reader, 'Guest', count])
+
+                # Most popular updates section
+                ws_performers.append([])
+                ws_performers.append(['Most Popular Updates'])
+                ws_performers.append(['Update Title', 'Process', 'Total Reads'])
+
+                # Reads per update and per lesson, ranked together
+                update_reads = select(
+                    ReadLog.update_id, func.count().label('read_count')
+                ).group_by(ReadLog.update_id).subquery()
+                lesson_reads = select(
+                    LessonReadLog.lesson_id, func.count().label('read_count')
+                ).group_by(LessonReadLog.lesson_id).subquery()
+                popular_content = union_all(
+                    select(
                         Update.name.label('title'),
                         Update.process.label('category'),
-                        func.count(ReadLog.id).label('read_count'),
-                        db.literal('Update').label('content_type')
-                    ).outerjoin(
-                        ReadLog, Update.id == ReadLog.update_id
-                    ).group_by(
-                        Update.id, Update.name, Update.process
-                    ).all()
-
-                    top_lessons = db.session.query(
+                        func.coalesce(update_reads.c.read_count, 0).label('read_count'),
+                        literal('Update').label('content_type')
+                    ).outerjoin(update_reads, Update.id == update_reads.c.update_id),
+                    select(
                         LessonLearned.title.label('title'),
                         LessonLearned.department.label('category'),
-                        func.count(ReadLog.id).label('read_count'),
-                        db.literal('Lesson').label('content_type')
-                    ).outerjoin(
-                        ReadLog, LessonLearned.id == ReadLog.lesson_id
-                    ).group_by(
-                        LessonLearned.id, LessonLearned.title, LessonLearned.department
-                    ).all()
-
-                    # Combine and get top 10
-                    top_content = sorted(
-                        [(title, category, count, content_type) for title, category, count, content_type in top_updates] +
-                        [(title, category, count, content_type) for title, category, count, content_type in top_lessons],
-                        key=lambda x: x[2], reverse=True
-                    )[:10]
-
-            for title, category, count, content_type in top_content:
-                ws_performers.append([f"{content_type}: {title}", category or 'N/A', count])
-
-            # Sheet 7: Engagement Metrics by Process - Simplified
-            ws_engagement = wb.create_sheet("Engagement by Process")
-            ws_engagement.append(['Process', 'Total Updates', 'Total Reads', 'Unique Readers', 'Avg Reads per Update'])
-
-            with app.app_context():
-                try:
-                    # Get process metrics for updates
-                    update_metrics = db.session.query(
-                        Update.process.label('category'),
-                        func.count(func.distinct(Update.id)).label('content_count'),
-                        func.count(ReadLog.id).label('read_count'),
-                        db.literal('Update').label('content_type')
-                    ).outerjoin(
-                        ReadLog, Update.id == ReadLog.update_id
-                    ).group_by(
-                        Update.process
-                    ).all()
-
-                    # Get department metrics for lessons
-                    lesson_metrics = db.session.query(
-                        LessonLearned.department.label('category'),
-                        func.count(func.distinct(LessonLearned.id)).label('content_count'),
-                        func.count(LessonReadLog.id).label('read_count'),
-                        db.literal('Lesson').label('content_type')
-                    ).outerjoin(
-                        LessonReadLog, LessonLearned.id == LessonReadLog.lesson_id
-                    ).group_by(
-                        LessonLearned.department
-                    ).all()
-
-                    # Combine both
-                    all_metrics = update_metrics + lesson_metrics
-
-                except Exception as e:
-                    logger.warning(f"New read log tables not available for engagement metrics, using legacy table: {e}")
-                    # Fallback to legacy read_logs table - tables are separated now, this should not be reached
-                    update_metrics = db.session.query(
-                        Update.process.label('category'),
-                        func.count(func.distinct(Update.id)).label('content_count'),
-                        func.count(ReadLog.id).label('read_count'),
-                        db.literal('Update').label('content_type')
-                    ).outerjoin(
-                        ReadLog, Update.id == ReadLog.update_id
-                    ).group_by(
-                        Update.process
-                    ).all()
-
-                    lesson_metrics = db.session.query(
-                        LessonLearned.department.label('category'),
-                        func.count(func.distinct(LessonLearned.id)).label('content_count'),
-                        func.count(ReadLog.id).label('read_count'),
-                        db.literal('Lesson').label('content_type')
-                    ).outerjoin(
-                        ReadLog, LessonLearned.id == ReadLog.lesson_id
-                    ).group_by(
-                        LessonLearned.department
-                    ).all()
-
-                    # Combine both
-                    all_metrics = update_metrics + lesson_metrics
-
-                # Get unique readers per category
+                        func.coalesce(lesson_reads.c.read_count, 0).label('read_count'),
+                        literal('Lesson').label('content_type')
+                    ).outerjoin(lesson_reads, LessonLearned.id == lesson_reads.c.lesson_id)
+                ).subquery()
+                top_content = db.session.execute(
+                    select(popular_content).order_by(popular_content.c.read_count.desc()).limit(10)
+                ).all()
+
+                for title, category, count, content_type in top_content:
+                    ws_performers.append([f"{content_type}: {title}", category or 'N/A', count])
+
+                # Sheet 7: Engagement Metrics by Process - Simplified
+                ws_engagement = wb.add_sheet("Engagement by Process")
+                ws_engagement.append(['Process', 'Total Updates', 'Total Reads', 'Unique Readers', 'Avg Reads per Update'])
+
+                # Reads are counted per update/lesson first (read logs only, by
+                # their content id), then summed per process/department, so the
+                # outer join never multiplies content rows and needs no DISTINCT
+                update_read_counts = select(
+                    ReadLog.update_id, func.count().label('read_count')
+                ).group_by(ReadLog.update_id).subquery()
+                update_metrics = db.session.query(
+                    Update.process.label('category'),
+                    func.count(Update.id).label('content_count'),
+                    cast(func.coalesce(func.sum(update_read_counts.c.read_count), 0), db.Integer).label('read_count'),
+                    db.literal('Update').label('content_type')
+                ).outerjoin(
+                    update_read_counts, Update.id == update_read_counts.c.update_id
+                ).group_by(
+                    Update.process
+                ).all()
+
+                lesson_read_counts = select(
+                    LessonReadLog.lesson_id, func.count().label('read_count')
+                ).group_by(LessonReadLog.lesson_id).subquery()
+                lesson_metrics = db.session.query(
+                    LessonLearned.department.label('category'),
+                    func.count(LessonLearned.id).label('content_count'),
+                    cast(func.coalesce(func.sum(lesson_read_counts.c.read_count), 0), db.Integer).label('read_count'),
+                    db.literal('Lesson').label('content_type')
+                ).outerjoin(
+                    lesson_read_counts, LessonLearned.id == lesson_read_counts.c.lesson_id
+                ).group_by(
+                    LessonLearned.department
+                ).all()
+
+                # Combine both
+                all_metrics = update_metrics + lesson_metrics
+
+                # Unique readers (registered users plus named guests) per
+                # process and per department, one grouped query each
+                update_unique_readers = db.session.query(
+                    Update.process,
+                    func.count(func.distinct(ReadLog.user_id)),
+                    func.count(func.distinct(case((ReadLog.user_id.is_(None), ReadLog.guest_name))))
+                ).join(
+                    ReadLog, Update.id == ReadLog.update_id
+                ).group_by(
+                    Update.process
+                ).all()
+
+                lesson_unique_readers = db.session.query(
+                    LessonLearned.department,
+                    func.count(func.distinct(LessonReadLog.user_id)),
+                    func.count(func.distinct(case((LessonReadLog.user_id.is_(None), LessonReadLog.guest_name))))
+                ).join(
+                    LessonReadLog, LessonLearned.id == LessonReadLog.lesson_id
+                ).group_by(
+                    LessonLearned.department
+                ).all()
+
                 category_unique_readers = {}
-                for category, _, _, content_type in all_metrics:
-                    if content_type == 'Update':
-                        # Count unique registered users for this process
-                        registered_count = db.session.query(
-                            func.count(func.distinct(ReadLog.user_id))
-                        ).join(
-                            Update, ReadLog.update_id == Update.id
-                        ).filter(
-                            Update.process == category,
-                            ReadLog.user_id.isnot(None)
-                        ).scalar()
-
-                        # Count unique guest users for this process
-                        guest_count = db.session.query(
-                            func.count(func.distinct(ReadLog.guest_name))
-                        ).join(
-                            Update, ReadLog.update_id == Update.id
-                        ).filter(
-                            Update.process == category,
-                            ReadLog.user_id.is_(None),
-                            ReadLog.guest_name.isnot(None)
-                        ).scalar()
-                    else:  # Lesson
-                        # Count unique registered users for this department
-                        registered_count = db.session.query(
-                            func.count(func.distinct(LessonReadLog.user_id))
-                        ).join(
-                            LessonLearned, LessonReadLog.lesson_id == LessonLearned.id
-                        ).filter(
-                            LessonLearned.department == category,
-                            LessonReadLog.user_id.isnot(None)
-                        ).scalar()
-
-                        # Count unique guest users for this department
-                        guest_count = db.session.query(
-                            func.count(func.distinct(LessonReadLog.guest_name))
-                        ).join(
-                            LessonLearned, LessonReadLog.lesson_id == LessonLearned.id
-                        ).filter(
-                            LessonLearned.department == category,
-                            LessonReadLog.user_id.is_(None),
-                            LessonReadLog.guest_name.isnot(None)
-                        ).scalar()
-
-                    category_unique_readers[category] = (registered_count or 0) + (guest_count or 0)
-
-            for category, content_count, read_count, content_type in all_metrics:
-                unique_readers = category_unique_readers.get(category, 0)
-                avg_reads = round(read_count / content_count, 2) if content_count > 0 else 0
-                ws_engagement.append([f"{content_type}: {category or 'N/A'}", content_count, read_count, unique_readers, avg_reads])
-
-            # Skip auto-adjust column widths for faster export
+                for content_type, rows in (('Update', update_unique_readers), ('Lesson', lesson_unique_readers)):
+                    for category, registered_count, guest_count in rows:
+                        category_unique_readers[(content_type, category)] = (registered_count or 0) + (guest_count or 0)
+
+                for category, content_count, read_count, content_type in all_metrics:
+                    unique_readers = category_unique_readers.get((content_type, category), 0)
+                    avg_reads = round(read_count / content_count, 2) if content_count > 0 else 0
+                    ws_engagement.append([f"{content_type}: {category or 'N/A'}", content_count, read_count, unique_readers, avg_reads])
+
+                # Skip auto-adjust column widths for faster export
 
             # Generate timestamp for filename
             timestamp_str = format_ist(now_utc(), '%Y%m%d_%H%M%S')
 
-            # Save workbook to BytesIO
-            excel_buffer = BytesIO()
-            wb.save(excel_buffer)
-            excel_buffer.seek(0)
-
             # Return Excel response
-            response = Response(
-                excel_buffer.getvalue(),
+            response = send_file(
+                export_file.name,
                 mimetype='application/vnd.openxmlformats-officedocument.spreadsheetml.sheet',
-                headers={
-                    'Content-Disposition': f'attachment; filename=readlogs_export_{timestamp_str}.xlsx',
-                    'Cache-Control': 'no-cache'
-                }
+                as_attachment=True,
+                download_name=f'readlogs_export_{timestamp_str}.xlsx',
+                conditional=True,
+                max_age=0
             )
+            response.headers['Cache-Control'] = DOWNLOAD_CACHE_CONTROL
             return response
 
-        except ImportError:
-            logger.error("openpyxl not available, falling back to CSV export")
-            flash("Excel export library not available. Please install required dependencies.", "error")
-            return redirect(url_for('export_readlogs'))
         except Exception as e:
             logger.error(f"Error generating Excel export: {e}")
             flash("Error generating export file. Please try again.", "error")
@@ -2760,16 +2786,23 @@ def create_app(config_name=None):
                 return redirect(url_for('export_readlogs'))
 
             # Verify admin password
-            current_user = User.query.get(session.get("user_id"))
+            current_user = get_current_user()
             if not current_user or not current_user.check_password(admin_password):
                 flash("Invalid admin password.", "error")
                 return redirect(url_for('export_readlogs'))
 
+            # Write out queued entries first so they are included in the reset
+            activity_writer.flush()
+
             # Get count before deletion for logging
-            count_before = ActivityLog.query.count()
+            count_before = db.session.query(func.count(ActivityLog.id)).scalar()
 
-            # Delete all activity logs
-            ActivityLog.query.delete()
+            # Delete all activity logs; on Postgres TRUNCATE avoids a
+            # row-by-row DELETE, elsewhere skip syncing the session
+            if db.engine.dialect.name == "postgresql":
+                db.session.execute(text("TRUNCATE TABLE activity_logs RESTART IDENTITY"))
+            else:
+                ActivityLog.query.delete(synchronize_session=False)
 
             # Commit the changes
             db.session.commit()
@@ -2805,11 +2838,8 @@ def create_app(config_name=None):
                                       backup_disabled=True,
                                       is_vercel=True)
 
-            logger.info("Loading backup page - importing backup system")
-            from backup_system import DatabaseBackupSystem
-
-            logger.info("Creating DatabaseBackupSystem instance")
-            backup_system = DatabaseBackupSystem()
+            logger.info("Loading backup page")
+            backup_system = get_backup_system()
 
             # Check if backup is enabled (handles other read-only file systems)
             if not hasattr(backup_system, 'backup_enabled') or not backup_system.backup_enabled:
@@ -2845,7 +2875,6 @@ def create_app(config_name=None):
         except Exception as e:
             logger.error(f"Error loading backup page: {e}")
             logger.error(f"Error type: {type(e).__name__}")
-            import traceback
             logger.error(f"Full traceback: {traceback.format_exc()}")
             flash(f"Error loading backup page: {str(e)}. Please try again later.", "error")
             return redirect(url_for("home"))
@@ -2863,8 +2892,7 @@ def create_app(config_name=None):
                 flash("❌ Backup functionality is not available on Vercel (read-only file system). Consider using database export features or cloud storage alternatives.", "error")
                 return redirect(url_for('backup_page'))
 
-            from backup_system import DatabaseBackupSystem
-            backup_system = DatabaseBackupSystem()
+            backup_system = get_backup_system()
 
             # Check if backup is enabled
             if not hasattr(backup_system, 'backup_enabled') or not backup_system.backup_enabled:
@@ -2900,8 +2928,7 @@ def create_app(config_name=None):
                 flash("❌ Backup functionality is not available on Vercel (read-only file system).", "error")
                 return redirect(url_for('backup_page'))
 
-            from backup_system import DatabaseBackupSystem
-            backup_system = DatabaseBackupSystem()
+            backup_system = get_backup_system()
 
             # Find the backup file
             backups = backup_system.list_backups()
@@ -2920,10 +2947,20 @@ def create_app(config_name=None):
             # Log the download
             log_activity('downloaded', 'backup', filename, f'Backup file downloaded: {filename}')
 
-            return send_file(backup_path,
-                            as_attachment=True,
-                            download_name=f"{filename}.json",
-                            mimetype='application/json')
+            if backup_info.get('compressed'):
+                response = send_file(backup_path,
+                                     as_attachment=True,
+                                     download_name=f"{filename}.json.gz",
+                                     mimetype='application/gzip',
+                                     max_age=0)
+            else:
+                response = send_file(backup_path,
+                                     as_attachment=True,
+                                     download_name=f"{filename}.json",
+                                     mimetype='application/json',
+                                     max_age=0)
+            response.headers['Cache-Control'] = DOWNLOAD_CACHE_CONTROL
+            return response
 
         except Exception as e:
             logger.error(f"Error downloading backup: {e}")
@@ -2943,8 +2980,7 @@ def create_app(config_name=None):
                 flash("❌ Backup functionality is not available on Vercel (read-only file system).", "error")
                 return redirect(url_for('backup_page'))
 
-            from backup_system import DatabaseBackupSystem
-            backup_system = DatabaseBackupSystem()
+            backup_system = get_backup_system()
 
             # Find the backup file
             backups = backup_system.list_backups()
@@ -2954,12 +2990,19 @@ def create_app(config_name=None):
                 flash("Backup file not found.", "error")
                 return redirect(url_for('backup_page'))
 
-            backup_path = Path(backup_info['path'])
-            if backup_system.restore_backup(backup_path):
-                flash("✅ Database restored successfully.", "success")
-                log_activity('restored', 'backup', filename, f'Database restored from: {filename}')
-            else:
-                flash("❌ Failed to restore backup.", "error")
+            # The activity row is captured now, while the request is
+            # available, and written once the restore has succeeded
+            activity = activity_row('restored', 'backup', filename, f'Database restored from: {filename}')
+
+            def on_restored():
+                # Every cached aggregate may be stale after a full restore
+                _cache.clear()
+                activity['timestamp'] = now_utc()
+                activity_writer.enqueue(activity)
+
+            job_id = restore_runner.submit(backup_system, Path(backup_info['path']), filename, on_success=on_restored)
+            flash("⏳ Restore started. This page updates when it finishes.", "info")
+            return redirect(url_for('backup_restore_status', job_id=job_id))
 
         except Exception as e:
             logger.error(f"Error restoring backup: {e}")
@@ -2967,6 +3010,19 @@ def create_app(config_name=None):
 
         return redirect(url_for('backup_page'))
 
+    @app.route("/backup/restore/status/<job_id>")
+    @admin_required
+    def backup_restore_status(job_id):
+        """Show the progress of a background restore"""
+        job = restore_runner.get(job_id)
+        if not job:
+            flash("Restore job not found. It may have been started by another server process.", "error")
+            return redirect(url_for('backup_page'))
+
+        return render_template("restore_status.html",
+                             job=job,
+                             app_name=app.config["APP_NAME"])
+
     @app.route("/backup/delete/<filename>", methods=["POST"])
     @admin_required
     @performance_logger
@@ -2980,26 +3036,12 @@ def create_app(config_name=None):
                 flash("❌ Backup functionality is not available on Vercel (read-only file system).", "error")
                 return redirect(url_for('backup_page'))
 
-            from backup_system import DatabaseBackupSystem
-            backup_system = DatabaseBackupSystem()
-
-            # Find the backup file
-            backups = backup_system.list_backups()
-            backup_info = next((b for b in backups if b['filename'] == filename), None)
-
-            if not backup_info:
-                flash("Backup file not found.", "error")
-                return redirect(url_for('backup_page'))
-
-            backup_path = backup_info['path']
-
-            if os.path.exists(backup_path):
-                os.remove(backup_path)
+            if get_backup_system().delete_backup(filename):
                 flash(f"✅ Backup file '{filename}' deleted successfully.", "success")
                 # Log the deletion
                 log_activity('deleted', 'backup', filename, f'Backup file deleted: {filename}')
             else:
-                flash("Backup file not found on disk.", "error")
+                flash("Backup file not found.", "error")
 
         except Exception as e:
             logger.error(f"Error deleting backup: {e}")
@@ -3020,8 +3062,7 @@ def create_app(config_name=None):
                 flash("❌ Backup functionality is not available on Vercel (read-only file system).", "error")
                 return redirect(url_for('backup_page'))
 
-            from backup_system import DatabaseBackupSystem
-            backup_system = DatabaseBackupSystem()
+            backup_system = get_backup_system()
 
             keep_days = int(request.form.get("keep_days", 30))
             deleted_count = backup_system.cleanup_old_backups(keep_days)
@@ -3066,9 +3107,6 @@ def create_app(config_name=None):
     def export_database_json():
         """Export database as JSON"""
         try:
-            from io import BytesIO
-            import json
-            from datetime import datetime
 
             # Collect all data
             export_data = {
@@ -3190,10 +3228,18 @@ def create_app(config_name=None):
                 mimetype='application/json',
                 headers={
                     'Content-Disposition': f'attachment; filename=loopin_export_{timestamp_str}.json',
-                    'Cache-Control': 'no-cache'
+                    'Cache-Control': DOWNLOAD_CACHE_CONTROL,
+                    'Vary': 'Accept-Encoding'
                 }
             )
 
+            # The indented JSON compresses well; browsers decode gzip
+            # transparently, so the saved file is still plain .json. Level 1
+            # keeps the CPU cost low.
+            if 'gzip' in request.accept_encodings:
+                response.set_data(gzip.compress(response.get_data(), compresslevel=1))
+                response.headers['Content-Encoding'] = 'gzip'
+
             flash("✅ Database exported successfully as JSON.", "success")
             return response
 
@@ -3204,141 +3250,153 @@ def create_app(config_name=None):
     def export_database_csv():
         """Export database as CSV files in a ZIP archive"""
         try:
-            from io import BytesIO, StringIO
-            import zipfile
-            import csv
 
             # Create ZIP file in memory
             zip_buffer = BytesIO()
 
             with zipfile.ZipFile(zip_buffer, 'w', zipfile.ZIP_DEFLATED) as zip_file:
+                def write_csv_member(name, header, stmt, to_row):
+                    # Rows are read as plain column tuples in batches of 1000
+                    # and compressed into the archive as they are written.
+                    # Empty tables get no file, as before.
+                    rows = iter(db.session.execute(stmt.execution_options(yield_per=1000)))
+                    first = next(rows, None)
+                    if first is None:
+                        return
+                    with TextIOWrapper(zip_file.open(name, 'w'), encoding='utf-8', newline='') as output:
+                        writer = csv.writer(output)
+                        writer.writerow(header)
+                        writer.writerow(to_row(first))
+                        writer.writerows(map(to_row, rows))
+
                 # Export users
-                users = User.query.order_by(User.created_at.desc()).all()
-                if users:
-                    user_output = StringIO()
-                    writer = csv.writer(user_output)
-                    writer.writerow(['ID', 'Username', 'Display Name', 'Email', 'Role', 'Registration Date (IST)'])
-                    for user in users:
-                        created_at_value = getattr(user, 'created_at', None)
-                        ist_registration_date = format_ist(created_at_value, '%Y-%m-%d %H:%M:%S') if created_at_value else 'N/A'
-                        writer.writerow([
-                            user.id,
-                            user.username,
-                            user.display_name,
-                            user.email or 'N/A',
-                            user.role,
-                            ist_registration_date
-                        ])
-                    zip_file.writestr('users.csv', user_output.getvalue())
+                write_csv_member(
+                    'users.csv',
+                    ['ID', 'Username', 'Display Name', 'Email', 'Role', 'Registration Date (IST)'],
+                    select(User.id, User.username, User.display_name, User.email, User.role, User.created_at)
+                    .order_by(User.created_at.desc()),
+                    lambda user: [
+                        user.id,
+                        user.username,
+                        user.display_name,
+                        user.email or 'N/A',
+                        user.role,
+                        format_ist(user.created_at, '%Y-%m-%d %H:%M:%S') if user.created_at else 'N/A'
+                    ]
+                )
 
                 # Export updates
-                updates = Update.query.all()
-                if updates:
-                    update_output = StringIO()
-                    writer = csv.writer(update_output)
-                    writer.writerow(['ID', 'Name', 'Process', 'Message', 'Timestamp'])
-                    for update in updates:
-                        writer.writerow([
-                            update.id,
-                            update.name,
-                            update.process,
-                            update.message,
-                            update.timestamp.isoformat()
-                        ])
-                    zip_file.writestr('updates.csv', update_output.getvalue())
+                write_csv_member(
+                    'updates.csv',
+                    ['ID', 'Name', 'Process', 'Message', 'Timestamp'],
+                    select(Update.id, Update.name, Update.process, Update.message, Update.timestamp),
+                    lambda update: [
+                        update.id,
+                        update.name,
+                        update.process,
+                        update.message,
+                        update.timestamp.isoformat()
+                    ]
+                )
 
                 # Export update read logs
-                update_read_logs = ReadLog.query.all()
-                if update_read_logs:
-                    update_read_log_output = StringIO()
-                    writer = csv.writer(update_read_log_output)
-                    writer.writerow(['ID', 'Update ID', 'User ID', 'Guest Name', 'Timestamp', 'IP Address', 'User Agent'])
-                    for log in update_read_logs:
-                        writer.writerow([
-                            log.id,
-                            log.update_id,
-                            log.user_id,
-                            log.guest_name,
-                            log.timestamp.isoformat(),
-                            log.ip_address,
-                            log.user_agent
-                        ])
-                    zip_file.writestr('update_read_logs.csv', update_read_log_output.getvalue())
+                write_csv_member(
+                    'update_read_logs.csv',
+                    ['ID', 'Update ID', 'User ID', 'Guest Name', 'Timestamp', 'IP Address', 'User Agent'],
+                    select(
+                        ReadLog.id, ReadLog.update_id, ReadLog.user_id, ReadLog.guest_name,
+                        ReadLog.timestamp, ReadLog.ip_address, ReadLog.user_agent
+                    ),
+                    lambda log: [
+                        log.id,
+                        log.update_id,
+                        log.user_id,
+                        log.guest_name,
+                        log.timestamp.isoformat(),
+                        log.ip_address,
+                        log.user_agent
+                    ]
+                )
 
                 # Export lesson read logs
-                lesson_read_logs = LessonReadLog.query.all()
-                if lesson_read_logs:
-                    lesson_read_log_output = StringIO()
-                    writer = csv.writer(lesson_read_log_output)
-                    writer.writerow(['ID', 'Lesson ID', 'User ID', 'Guest Name', 'Timestamp', 'IP Address', 'User Agent'])
-                    for log in lesson_read_logs:
-                        writer.writerow([
-                            log.id,
-                            log.lesson_id,
-                            log.user_id,
-                            log.guest_name,
-                            log.timestamp.isoformat(),
-                            log.ip_address,
-                            log.user_agent
-                        ])
-                    zip_file.writestr('lesson_read_logs.csv', lesson_read_log_output.getvalue())
+                write_csv_member(
+                    'lesson_read_logs.csv',
+                    ['ID', 'Lesson ID', 'User ID', 'Guest Name', 'Timestamp', 'IP Address', 'User Agent'],
+                    select(
+                        LessonReadLog.id, LessonReadLog.lesson_id, LessonReadLog.user_id, LessonReadLog.guest_name,
+                        LessonReadLog.timestamp, LessonReadLog.ip_address, LessonReadLog.user_agent
+                    ),
+                    lambda log: [
+                        log.id,
+                        log.lesson_id,
+                        log.user_id,
+                        log.guest_name,
+                        log.timestamp.isoformat(),
+                        log.ip_address,
+                        log.user_agent
+                    ]
+                )
 
                 # Export SOP summaries
-                sops = SOPSummary.query.all()
-                if sops:
-                    sop_output = StringIO()
-                    writer = csv.writer(sop_output)
-                    writer.writerow(['ID', 'Title', 'Summary Text', 'Department', 'Tags', 'Created At'])
-                    for sop in sops:
-                        writer.writerow([
-                            sop.id,
-                            sop.title,
-                            sop.summary_text,
-                            sop.department,
-                            ','.join(sop.tags) if sop.tags else '',
-                            sop.created_at.isoformat()
-                        ])
-                    zip_file.writestr('sop_summaries.csv', sop_output.getvalue())
+                write_csv_member(
+                    'sop_summaries.csv',
+                    ['ID', 'Title', 'Summary Text', 'Department', 'Tags', 'Created At'],
+                    select(
+                        SOPSummary.id, SOPSummary.title, SOPSummary.summary_text, SOPSummary.department,
+                        SOPSummary.tags, SOPSummary.created_at
+                    ),
+                    lambda sop: [
+                        sop.id,
+                        sop.title,
+                        sop.summary_text,
+                        sop.department,
+                        ','.join(sop.tags) if sop.tags else '',
+                        sop.created_at.isoformat()
+                    ]
+                )
 
                 # Export lessons learned
-                lessons = LessonLearned.query.all()
-                if lessons:
-                    lesson_output = StringIO()
-                    writer = csv.writer(lesson_output)
-                    writer.writerow(['ID', 'Title', 'Content', 'Summary', 'Author', 'Department', 'Tags', 'Created At'])
-                    for lesson in lessons:
-                        writer.writerow([
-                            lesson.id,
-                            lesson.title,
-                            lesson.content,
-                            lesson.summary,
-                            lesson.author,
-                            lesson.department,
-                            ','.join(lesson.tags) if lesson.tags else '',
-                            lesson.created_at.isoformat()
-                        ])
-                    zip_file.writestr('lessons_learned.csv', lesson_output.getvalue())
+                write_csv_member(
+                    'lessons_learned.csv',
+                    ['ID', 'Title', 'Content', 'Summary', 'Author', 'Department', 'Tags', 'Created At'],
+                    select(
+                        LessonLearned.id, LessonLearned.title, LessonLearned.content, LessonLearned.summary,
+                        LessonLearned.author, LessonLearned.department, LessonLearned.tags, LessonLearned.created_at
+                    ),
+                    lambda lesson: [
+                        lesson.id,
+                        lesson.title,
+                        lesson.content,
+                        lesson.summary,
+                        lesson.author,
+                        lesson.department,
+                        ','.join(lesson.tags) if lesson.tags else '',
+                        lesson.created_at.isoformat()
+                    ]
+                )
 
                 # Export activity logs (limit to recent for performance)
-                activities = ActivityLog.query.order_by(ActivityLog.timestamp.desc()).limit(1000).all()
-                if activities:
-                    activity_output = StringIO()
-                    writer = csv.writer(activity_output)
-                    writer.writerow(['ID', 'User ID', 'Action', 'Entity Type', 'Entity ID', 'Entity Title', 'Timestamp', 'IP Address', 'User Agent', 'Details'])
-                    for activity in activities:
-                        writer.writerow([
-                            activity.id,
-                            activity.user_id,
-                            activity.action,
-                            activity.entity_type,
-                            activity.entity_id,
-                            activity.entity_title,
-                            activity.timestamp.isoformat(),
-                            activity.ip_address,
-                            activity.user_agent,
-                            activity.details
-                        ])
-                    zip_file.writestr('activity_logs.csv', activity_output.getvalue())
+                write_csv_member(
+                    'activity_logs.csv',
+                    ['ID', 'User ID', 'Action', 'Entity Type', 'Entity ID', 'Entity Title', 'Timestamp', 'IP Address', 'User Agent', 'Details'],
+                    select(
+                        ActivityLog.id, ActivityLog.user_id, ActivityLog.action, ActivityLog.entity_type,
+                        ActivityLog.entity_id, ActivityLog.entity_title, ActivityLog.timestamp,
+                        ActivityLog.ip_address, ActivityLog.user_agent, ActivityLog.details
+                    ).order_by(ActivityLog.timestamp.desc()).limit(1000),
+                    lambda activity: [
+                        activity.id,
+                        activity.user_id,
+                        activity.action,
+                        activity.entity_type,
+                        activity.entity_id,
+                        activity.entity_title,
+                        activity.timestamp.isoformat(),
+                        activity.ip_address,
+                        activity.user_agent,
+                        activity.details
+                    ]
+                )
 
             zip_buffer.seek(0)
 
@@ -3349,7 +3407,7 @@ def create_app(config_name=None):
                 mimetype='application/zip',
                 headers={
                     'Content-Disposition': f'attachment; filename=loopin_export_{timestamp_str}.zip',
-                    'Cache-Control': 'no-cache'
+                    'Cache-Control': DOWNLOAD_CACHE_CONTROL
                 }
             )
 
@@ -3368,29 +3426,52 @@ def create_app(config_name=None):
     def archives_page():
         """Display archived items management page"""
         try:
-            # Get archived updates with user info
-            archived_updates = db.session.query(
-                ArchivedUpdate,
-                User.display_name.label('archived_by_name')
-            ).outerjoin(
-                User, ArchivedUpdate.archived_by == User.id
-            ).order_by(ArchivedUpdate.archived_at.desc()).all()
-
-            # Get archived SOPs with user info
-            archived_sops = db.session.query(
-                ArchivedSOPSummary,
-                User.display_name.label('archived_by_name')
-            ).outerjoin(
-                User, ArchivedSOPSummary.archived_by == User.id
-            ).order_by(ArchivedSOPSummary.archived_at.desc()).all()
-
-            # Get archived lessons with user info
-            archived_lessons = db.session.query(
-                ArchivedLessonLearned,
-                User.display_name.label('archived_by_name')
-            ).outerjoin(
-                User, ArchivedLessonLearned.archived_by == User.id
-            ).order_by(ArchivedLessonLearned.archived_at.desc()).all()
+            # All three archive tables in one UNION ALL round-trip, mapped to
+            # the columns the page shows; previews keep 101 characters so the
+            # template can tell whether to add "...". Archiving users are
+            # joined once, on the combined rows
+            def archived_select(kind, model, id_col, title, author, department, preview, created_at):
+                return select(
+                    literal(kind).label('kind'),
+                    id_col.label('id'),
+                    title.label('title'),
+                    author.label('author'),
+                    department.label('department'),
+                    func.substr(preview, 1, 101).label('preview'),
+                    created_at.label('created_at'),
+                    model.archived_at.label('archived_at'),
+                    model.archived_by.label('archived_by')
+                )
+
+            archived = union_all(
+                archived_select(
+                    'update', ArchivedUpdate, ArchivedUpdate.id, null(),
+                    ArchivedUpdate.name, ArchivedUpdate.process,
+                    ArchivedUpdate.message, ArchivedUpdate.timestamp
+                ),
+                archived_select(
+                    'sop', ArchivedSOPSummary, cast(ArchivedSOPSummary.id, db.String), ArchivedSOPSummary.title,
+                    null(), ArchivedSOPSummary.department,
+                    ArchivedSOPSummary.summary_text, ArchivedSOPSummary.created_at
+                ),
+                archived_select(
+                    'lesson', ArchivedLessonLearned, cast(ArchivedLessonLearned.id, db.String), ArchivedLessonLearned.title,
+                    ArchivedLessonLearned.author, ArchivedLessonLearned.department,
+                    ArchivedLessonLearned.content, ArchivedLessonLearned.created_at
+                )
+            ).subquery()
+
+            archived_by_kind = {'update': [], 'sop': [], 'lesson': []}
+            for row in db.session.execute(
+                select(archived, User.display_name.label('archived_by_name'))
+                .outerjoin(User, archived.c.archived_by == User.id)
+                .order_by(archived.c.archived_at.desc())
+            ):
+                archived_by_kind[row.kind].append(row)
+
+            archived_updates = archived_by_kind['update']
+            archived_sops = archived_by_kind['sop']
+            archived_lessons = archived_by_kind['lesson']
 
             return render_template("archives.html",
                                  archived_updates=archived_updates,
@@ -3403,75 +3484,42 @@ def create_app(config_name=None):
             flash("Error loading archived items.", "error")
             return redirect(url_for("home"))
 
-    @app.route("/archives/restore/<item_type>/<item_id>", methods=["POST"])
+    @app.route("/archives/restore/update/<item_id>", methods=["POST"], defaults={'item_type': 'update'})
+    @app.route("/archives/restore/sop/<int:item_id>", methods=["POST"], defaults={'item_type': 'sop'})
+    @app.route("/archives/restore/lesson/<int:item_id>", methods=["POST"], defaults={'item_type': 'lesson'})
     @admin_required
     def restore_archived_item(item_type, item_id):
         """Restore an archived item back to active status"""
         try:
             if item_type == 'update':
-                archived_item = ArchivedUpdate.query.get(item_id)
-                if archived_item:
-                    # Create new active update
-                    new_update = Update(
-                        id=archived_item.id,
-                        name=archived_item.name,
-                        process=archived_item.process,
-                        message=archived_item.message,
-                        timestamp=archived_item.timestamp
-                    )
-                    db.session.add(new_update)
-                    db.session.delete(archived_item)
+                restored = unarchive_row(ArchivedUpdate, item_id, func.substr(ArchivedUpdate.message, 1, 50))
+                if restored:
                     db.session.commit()
+                    invalidate_update_caches()
                     flash("✅ Update restored successfully.", "success")
 
                     # Log activity
-                    log_activity('restored', 'update', item_id, f"Update: {archived_item.message[:50]}...")
+                    log_activity('restored', 'update', item_id, f"Update: {restored[0]}...")
 
             elif item_type == 'sop':
-                archived_item = ArchivedSOPSummary.query.get(item_id)
-                if archived_item:
-                    # Create new active SOP
-                    new_sop = SOPSummary(
-                        id=archived_item.id,
-                        title=archived_item.title,
-                        summary_text=archived_item.summary_text,
-                        department=archived_item.department,
-                        tags=archived_item.tags,
-                        created_at=archived_item.created_at
-                    )
-                    db.session.add(new_sop)
-                    db.session.delete(archived_item)
+                restored = unarchive_row(ArchivedSOPSummary, item_id, ArchivedSOPSummary.title)
+                if restored:
                     db.session.commit()
+                    _cache.delete(SOP_COUNT_CACHE_KEY)
                     flash("✅ SOP Summary restored successfully.", "success")
 
                     # Log activity
-                    log_activity('restored', 'sop', item_id, archived_item.title)
+                    log_activity('restored', 'sop', item_id, restored.title)
 
             elif item_type == 'lesson':
-                archived_item = ArchivedLessonLearned.query.get(item_id)
-                if archived_item:
-                    # Create new active lesson
-                    new_lesson = LessonLearned(
-                        id=archived_item.id,
-                        title=archived_item.title,
-                        content=archived_item.content,
-                        summary=archived_item.summary,
-                        author=archived_item.author,
-                        department=archived_item.department,
-                        tags=archived_item.tags,
-                        created_at=archived_item.created_at
-                    )
-                    db.session.add(new_lesson)
-                    db.session.delete(archived_item)
+                restored = unarchive_row(ArchivedLessonLearned, item_id, ArchivedLessonLearned.title)
+                if restored:
                     db.session.commit()
+                    _cache.delete(LESSON_COUNT_CACHE_KEY)
                     flash("✅ Lesson Learned restored successfully.", "success")
 
                     # Log activity
-                    log_activity('restored', 'lesson', item_id, archived_item.title)
-
-            else:
-                flash("❌ Invalid item type.", "error")
-                return redirect(url_for("archives_page"))
+                    log_activity('restored', 'lesson', item_id, restored.title)
 
         except Exception as e:
             db.session.rollback()
@@ -3480,47 +3528,50 @@ def create_app(config_name=None):
 
         return redirect(url_for("archives_page"))
 
-    @app.route("/archives/delete/<item_type>/<item_id>", methods=["POST"])
+    @app.route("/archives/delete/update/<item_id>", methods=["POST"], defaults={'item_type': 'update'})
+    @app.route("/archives/delete/sop/<int:item_id>", methods=["POST"], defaults={'item_type': 'sop'})
+    @app.route("/archives/delete/lesson/<int:item_id>", methods=["POST"], defaults={'item_type': 'lesson'})
     @admin_required
     def delete_archived_item(item_type, item_id):
         """Permanently delete an archived item"""
         try:
+            # DELETE ... RETURNING fetches only what the flash and audit
+            # log need instead of loading the archived row first
             if item_type == 'update':
-                archived_item = ArchivedUpdate.query.get(item_id)
-                if archived_item:
-                    entity_title = f"Update: {archived_item.message[:50]}..."
-                    db.session.delete(archived_item)
+                deleted = db.session.execute(
+                    delete(ArchivedUpdate).where(ArchivedUpdate.id == item_id)
+                    .returning(func.substr(ArchivedUpdate.message, 1, 50))
+                ).first()
+                if deleted:
                     db.session.commit()
                     flash("✅ Archived update permanently deleted.", "success")
 
                     # Log activity
-                    log_activity('permanently_deleted', 'update', item_id, entity_title)
+                    log_activity('permanently_deleted', 'update', item_id, f"Update: {deleted[0]}...")
 
             elif item_type == 'sop':
-                archived_item = ArchivedSOPSummary.query.get(item_id)
-                if archived_item:
-                    entity_title = archived_item.title
-                    db.session.delete(archived_item)
+                deleted = db.session.execute(
+                    delete(ArchivedSOPSummary).where(ArchivedSOPSummary.id == item_id)
+                    .returning(ArchivedSOPSummary.title)
+                ).first()
+                if deleted:
                     db.session.commit()
                     flash("✅ Archived SOP permanently deleted.", "success")
 
                     # Log activity
-                    log_activity('permanently_deleted', 'sop', item_id, entity_title)
+                    log_activity('permanently_deleted', 'sop', item_id, deleted.title)
 
             elif item_type == 'lesson':
-                archived_item = ArchivedLessonLearned.query.get(item_id)
-                if archived_item:
-                    entity_title = archived_item.title
-                    db.session.delete(archived_item)
+                deleted = db.session.execute(
+                    delete(ArchivedLessonLearned).where(ArchivedLessonLearned.id == item_id)
+                    .returning(ArchivedLessonLearned.title)
+                ).first()
+                if deleted:
                     db.session.commit()
                     flash("✅ Archived lesson permanently deleted.", "success")
 
                     # Log activity
-                    log_activity('permanently_deleted', 'lesson', item_id, entity_title)
-
-            else:
-                flash("❌ Invalid item type.", "error")
-                return redirect(url_for("archives_page"))
+                    log_activity('permanently_deleted', 'lesson', item_id, deleted.title)
 
         except Exception as e:
             db.session.rollback()
@@ -3531,57 +3582,44 @@ def create_app(config_name=None):
 
     # Additional functionality removed for light version
 
-    # Add cache control for static files to prevent 304 caching issues
-    @app.after_request
-    def add_cache_control(response):
-        if request.path.startswith('/static/'):
-            # Don't cache JS and CSS files in development
-            if app.config.get('DEBUG', False) or os.getenv('FLASK_ENV') != 'production':
-                if request.path.endswith(('.js', '.css')):
-                    response.headers['Cache-Control'] = 'no-cache, no-store, must-revalidate'
-                    response.headers['Pragma'] = 'no-cache'
-                    response.headers['Expires'] = '0'
-            else:
-                # In production, cache static files aggressively
-                if request.path.endswith(('.js', '.css', '.png', '.jpg', '.jpeg', '.gif', '.ico', '.svg')):
-                    response.headers['Cache-Control'] = 'public, max-age=31536000'  # 1 year
-                    response.headers['Expires'] = (datetime.utcnow() + timedelta(days=365)).strftime('%a, %d %b %Y %H:%M:%S GMT')
-
-
-        # Add Vercel-specific headers (only essential ones in production)
-        is_production = os.getenv("FLASK_ENV") == "production"
-        is_development = os.getenv("FLASK_ENV") == "development" or not is_production
-
-        # Essential headers for all environments
-        response.headers['X-Server-Version'] = 'LoopIn-v1.0'
-
-        # Add debug headers only in development
-        if is_development:
-            response.headers['X-Debug-Mode'] = 'true'
+    # Response headers. In production static caching is left to
+    # LoopinFlask.get_send_file_max_age, so the hook only adds the essential headers;
+    # which hook to register is decided once here rather than per response
+    if is_production:
+        @app.after_request
+        def add_server_headers(response):
+            response.headers.update(_BASE_RESPONSE_HEADERS)
+            return response
+    else:
+        # Add cache control for static files to prevent 304 caching issues
+        @app.after_request
+        def add_cache_control(response):
+            if request.path.startswith('/static/'):
+                # Don't cache JS and CSS files in development
+                static_headers = _DEV_STATIC_HEADERS_BY_EXT.get(os.path.splitext(request.path)[1].lower())
+                if static_headers:
+                    response.headers.update(static_headers)
+
+            # Essential headers for all environments, plus debug headers
+            response.headers.update(_BASE_RESPONSE_HEADERS)
+            response.headers.update(_DEV_RESPONSE_HEADERS)
             response.headers['X-Timestamp'] = now_utc().isoformat()
-            response.headers['X-Status'] = 'healthy'
 
-        return response
+            return response
 
     # Global error handlers to prevent worker crashes
     @app.errorhandler(404)
     def handle_404_error(error):
         """Handle 404 Not Found Error"""
         logger.warning(f"404 Not Found: {error}")
-        return jsonify({
-            'error': 'Not Found',
-            'message': 'The requested resource was not found.'
-        }), 404
+        return Response(_NOT_FOUND_BODY, 404, mimetype='application/json')
 
     @app.errorhandler(500)
     def handle_500_error(error):
         """Handle 500 Internal Server Error"""
         logger.error(f"500 Internal Server Error: {error}")
         db.session.rollback()  # Rollback any pending transactions
-        return jsonify({
-            'error': 'Internal Server Error',
-            'message': 'An unexpected error occurred. Please try again later.'
-        }), 500
+        return Response(_INTERNAL_ERROR_BODY, 500, mimetype='application/json')
 
     @app.errorhandler(Exception)
     def handle_unexpected_error(error):
@@ -3589,28 +3627,19 @@ def create_app(config_name=None):
         logger.error(f"Unexpected error: {error}")
         try:
             db.session.rollback()  # Rollback any pending transactions
-        except:
+        except Exception:
             pass
-        return jsonify({
-            'error': 'Unexpected Error',
-            'message': 'An unexpected error occurred.'
-        }), 500
+        return Response(_UNEXPECTED_ERROR_BODY, 500, mimetype='application/json')
 
 
-    # Database teardown for request context
+    # Flask-SQLAlchemy removes the scoped session when the app context is
+    # torn down, and removing it rolls back anything left uncommitted, so
+    # this hook only has to log
     @app.teardown_request
     def teardown_request(exception):
-        """Clean up database session after each request"""
+        """Log exceptions that escaped the error handlers"""
         if exception:
             logger.error(f"Request exception: {exception}")
-            try:
-                db.session.rollback()
-            except:
-                pass
-        try:
-            db.session.remove()
-        except:
-            pass
 
 
     # Logging setup removed for Vercel deployment
@@ -1,6 +1,7 @@
 """Database backup and restore system for LoopIn"""
 
 import os
+import gzip
 import json
 import shutil
 from datetime import datetime
@@ -15,6 +16,28 @@ from timezone_utils import now_utc, format_ist
 
 logger = logging.getLogger(__name__)
 
+# New backups are written gzip-compressed; plain .json backups from older
+# releases are still listed, downloaded and restored
+COMPRESSED_BACKUP_SUFFIX = ".json.gz"
+BACKUP_SUFFIXES = (COMPRESSED_BACKUP_SUFFIX, ".json")
+BACKUP_COMPRESSLEVEL = 6
+
+
+def open_backup_file(backup_path: Path):
+    """Open a backup file for reading text, decompressing if needed"""
+    if str(backup_path).endswith(".gz"):
+        return gzip.open(backup_path, 'rt', encoding='utf-8')
+    return open(backup_path, 'r', encoding='utf-8')
+
+
+def backup_name(backup_path: Path) -> str:
+    """Backup name without its .json / .json.gz suffix"""
+    name = Path(backup_path).name
+    for suffix in BACKUP_SUFFIXES:
+        if name.endswith(suffix):
+            return name[:-len(suffix)]
+    return Path(backup_path).stem
+
 class DatabaseBackupSystem:
     """Handles database backup and restore operations"""
 
@@ -146,8 +169,10 @@ class DatabaseBackupSystem:
                 } for activity in activities
             ]
 
-            # Save backup to JSON file
-            with open(f"{backup_path}.json", 'w', encoding='utf-8') as f:
+            # Save backup to a gzip-compressed JSON file; compressing once here
+            # keeps every later download small
+            with gzip.open(f"{backup_path}{COMPRESSED_BACKUP_SUFFIX}", 'wt', encoding='utf-8',
+                           compresslevel=BACKUP_COMPRESSLEVEL) as f:
                 json.dump(backup_data, f, indent=2, ensure_ascii=False)
 
             logger.info(f"Backup created successfully: {backup_path}")
@@ -163,7 +188,7 @@ class DatabaseBackupSystem:
             if not backup_path.exists():
                 return False
 
-            with open(backup_path, 'r', encoding='utf-8') as f:
+            with open_backup_file(backup_path) as f:
                 backup_data = json.load(f)
 
             # Basic validation
@@ -183,7 +208,7 @@ class DatabaseBackupSystem:
         """Restore database from backup"""
         try:
             # Load backup data
-            with open(backup_path, 'r', encoding='utf-8') as f:
+            with open_backup_file(backup_path) as f:
                 backup_data = json.load(f)
 
             # Clear existing data (optional - be careful!)
@@ -218,18 +243,23 @@ class DatabaseBackupSystem:
                 )
                 db.session.add(update)
 
-            # Restore read logs
-            for log_data in backup_data["data"]["read_logs"]:
-                log = ReadLog(
-                    id=log_data["id"],
-                    update_id=log_data["update_id"],
-                    user_id=log_data["user_id"],
-                    guest_name=log_data["guest_name"],
-                    timestamp=datetime.fromisoformat(log_data["timestamp"]),
-                    ip_address=log_data["ip_address"],
-                    user_agent=log_data["user_agent"]
-                )
-                db.session.add(log)
+            # Read logs reference users and updates, which must be written
+            # before the bulk insert below
+            db.session.flush()
+
+            # Restore read logs (high-volume, so one executemany rather than
+            # an ORM object per row)
+            db.session.bulk_insert_mappings(ReadLog, [
+                {
+                    "id": log_data["id"],
+                    "update_id": log_data["update_id"],
+                    "user_id": log_data["user_id"],
+                    "guest_name": log_data["guest_name"],
+                    "timestamp": datetime.fromisoformat(log_data["timestamp"]),
+                    "ip_address": log_data["ip_address"],
+                    "user_agent": log_data["user_agent"]
+                } for log_data in backup_data["data"]["read_logs"]
+            ])
 
             # Restore SOP summaries
             for sop_data in backup_data["data"]["sop_summaries"]:
@@ -257,21 +287,21 @@ class DatabaseBackupSystem:
                 )
                 db.session.add(lesson)
 
-            # Restore activity logs
-            for activity_data in backup_data["data"]["activity_logs"]:
-                activity = ActivityLog(
-                    id=activity_data["id"],
-                    user_id=activity_data["user_id"],
-                    action=activity_data["action"],
-                    entity_type=activity_data["entity_type"],
-                    entity_id=activity_data["entity_id"],
-                    entity_title=activity_data["entity_title"],
-                    timestamp=datetime.fromisoformat(activity_data["timestamp"]),
-                    ip_address=activity_data["ip_address"],
-                    user_agent=activity_data["user_agent"],
-                    details=activity_data["details"]
-                )
-                db.session.add(activity)
+            # Restore activity logs (high-volume, bulk like the read logs)
+            db.session.bulk_insert_mappings(ActivityLog, [
+                {
+                    "id": activity_data["id"],
+                    "user_id": activity_data["user_id"],
+                    "action": activity_data["action"],
+                    "entity_type": activity_data["entity_type"],
+                    "entity_id": activity_data["entity_id"],
+                    "entity_title": activity_data["entity_title"],
+                    "timestamp": datetime.fromisoformat(activity_data["timestamp"]),
+                    "ip_address": activity_data["ip_address"],
+                    "user_agent": activity_data["user_agent"],
+                    "details": activity_data["details"]
+                } for activity_data in backup_data["data"]["activity_logs"]
+            ])
 
             db.session.commit()
             logger.info(f"Backup restored successfully from: {backup_path}")
@@ -282,6 +312,13 @@ class DatabaseBackupSystem:
             logger.error(f"Failed to restore backup: {e}")
             return False
 
+    def _backup_files(self) -> List[Path]:
+        """All backup files in the backup directory, compressed or not"""
+        files = []
+        for suffix in BACKUP_SUFFIXES:
+            files.extend(self.backup_dir.glob(f"*{suffix}"))
+        return files
+
     def list_backups(self) -> List[Dict[str, Any]]:
         """List all available backups"""
         if not self.backup_enabled:
@@ -298,13 +335,13 @@ class DatabaseBackupSystem:
                 return []
 
             backups = []
-            json_files = list(self.backup_dir.glob("*.json"))
+            json_files = self._backup_files()
             logger.info(f"Found {len(json_files)} JSON files in backup directory")
 
             for backup_file in json_files:
                 try:
                     logger.debug(f"Processing backup file: {backup_file}")
-                    with open(backup_file, 'r', encoding='utf-8') as f:
+                    with open_backup_file(backup_file) as f:
                         data = json.load(f)
 
                     # Ensure metadata exists
@@ -320,11 +357,12 @@ class DatabaseBackupSystem:
                         continue
 
                     backup_info = {
-                        "filename": backup_file.stem,
+                        "filename": backup_name(backup_file),
                         "timestamp": metadata["timestamp"],
                         "type": metadata.get("type", "unknown"),
                         "size": backup_file.stat().st_size,
-                        "path": str(backup_file)
+                        "path": str(backup_file),
+                        "compressed": backup_file.name.endswith(COMPRESSED_BACKUP_SUFFIX)
                     }
                     backups.append(backup_info)
                     logger.debug(f"Added backup: {backup_info['filename']}")
@@ -359,6 +397,24 @@ class DatabaseBackupSystem:
             logger.error(f"Full traceback: {traceback.format_exc()}")
             return []
 
+    def delete_backup(self, name: str) -> bool:
+        """Delete the backup file called ``name`` (without its suffix).
+
+        The file is unlinked directly rather than looked up through
+        list_backups(), which would read every backup. Returns False if no
+        such backup exists.
+        """
+        if Path(name).name != name:
+            return False
+
+        for suffix in BACKUP_SUFFIXES:
+            try:
+                (self.backup_dir / f"{name}{suffix}").unlink()
+                return True
+            except FileNotFoundError:
+                continue
+        return False
+
     def cleanup_old_backups(self, keep_days: int = 30) -> int:
         """Clean up old backup files"""
         if not self.backup_enabled:
@@ -370,7 +426,7 @@ class DatabaseBackupSystem:
             current_time = time.time()
             deleted_count = 0
 
-            for backup_file in self.backup_dir.glob("*.json"):
+            for backup_file in self._backup_files():
                 # Check if file is older than keep_days
                 if current_time - backup_file.stat().st_mtime > (keep_days * 24 * 60 * 60):
                     backup_file.unlink()
@@ -0,0 +1,84 @@
+"""Thread-safe in-memory caching utilities for LoopIn"""
+
+import threading
+import time
+from typing import Any, Hashable, Optional
+
+
+class TTLCache:
+    """Bounded key/value cache with per-entry expiry.
+
+    All operations take an internal lock, so one instance can be shared by
+    every request thread of a worker. Expired entries are swept in one pass
+    at most every ``sweep_interval`` seconds, on a write; when the cache is
+    full, expired entries are dropped first and then the oldest entries.
+    """
+
+    def __init__(self, maxsize: int = 1000, ttl: float = 600, sweep_interval: float = 60):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.sweep_interval = sweep_interval
+        self._data = {}  # key -> (expires_at, value), in insertion order
+        self._lock = threading.RLock()
+        self._next_sweep = time.monotonic() + sweep_interval
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        """Return the cached value, or ``default`` if missing or expired"""
+        now = time.monotonic()
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None:
+                return default
+            expires_at, value = entry
+            if expires_at <= now:
+                del self._data[key]
+                return default
+            return value
+
+    def set(self, key: Hashable, value: Any, ttl: Optional[float] = None):
+        """Store ``value`` for ``ttl`` seconds (defaults to the cache TTL)"""
+        now = time.monotonic()
+        expires_at = now + (self.ttl if ttl is None else ttl)
+        with self._lock:
+            self._data.pop(key, None)
+            if now >= self._next_sweep:
+                self._sweep(now)
+            if len(self._data) >= self.maxsize:
+                self._evict(now)
+            self._data[key] = (expires_at, value)
+
+    def delete(self, key: Hashable):
+        """Drop a single key if present"""
+        with self._lock:
+            self._data.pop(key, None)
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+
+    def expire(self) -> int:
+        """Remove all expired entries; returns how many were removed"""
+        with self._lock:
+            return self._sweep(time.monotonic())
+
+    def _sweep(self, now: float) -> int:
+        # Caller holds the lock
+        data = self._data
+        expired = [key for key, (expires_at, _) in data.items() if expires_at <= now]
+        for key in expired:
+            data.pop(key, None)
+        self._next_sweep = now + self.sweep_interval
+        return len(expired)
+
+    def _evict(self, now: float):
+        # Caller holds the lock
+        self._sweep(now)
+        while len(self._data) >= self.maxsize:
+            # Oldest insertion first
+            del self._data[next(iter(self._data))]
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def __contains__(self, key: Hashable) -> bool:
+        return self.get(key) is not None
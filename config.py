@@ -62,8 +62,8 @@ class ProductionConfig(Config):
         "pool_pre_ping": True,      # Enable connection health checks
         "pool_recycle": 300,        # Recycle connections after 5 minutes
         "pool_timeout": 20,         # Connection timeout
-        "max_overflow": 5,          # Maximum overflow
-        "pool_size": 3,            # Base pool size for Vercel
+        "max_overflow": int(os.getenv("SQLALCHEMY_MAX_OVERFLOW", 20)),  # Maximum overflow
+        "pool_size": int(os.getenv("SQLALCHEMY_POOL_SIZE", 10)),        # Base pool size
         "echo": False,             # Don't log SQL statements in production
         "echo_pool": False,        # Don't log pool operations
         "pool_reset_on_return": "rollback"  # Reset connection state on return
@@ -38,15 +38,20 @@ def clean_database_url(database_url):
 # Database query performance monitoring
 def log_query_performance(query, params=None, duration=None):
     """Log slow database queries for performance analysis"""
-    if duration and duration > 0.5:  # Log queries taking more than 500ms
-        logger.warning(".3f"
-                       f"query_type={type(query).__name__} "
-                       f"params={str(params)[:100] if params else 'None'}",
-                       duration)
-    elif duration:
-        logger.info(".3f"
-                    f"query_type={type(query).__name__}",
-                    duration)
+    if not duration:
+        return
+    fields = {
+        'duration_ms': int(duration * 1000),
+        'query_type': type(query).__name__,
+    }
+    if duration > 0.5:  # Log queries taking more than 500ms
+        logger.warning(
+            "Slow query - Duration: %.3fs - query_type=%s params=%s",
+            duration, fields['query_type'], str(params)[:100] if params else 'None',
+            extra=fields
+        )
+    else:
+        logger.debug("Query - Duration: %.3fs - query_type=%s", duration, fields['query_type'], extra=fields)
 
 def get_db_url():
     """Get database URL with proper SSL configuration"""
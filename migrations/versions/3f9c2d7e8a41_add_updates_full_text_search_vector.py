@@ -0,0 +1,42 @@
+"""Add full-text search vector to updates
+
+Revision ID: 3f9c2d7e8a41
+Revises: ab167799501f
+Create Date: 2026-10-16 10:05:12.418230
+
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision = '3f9c2d7e8a41'
+down_revision = 'ab167799501f'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # Full-text search is PostgreSQL-only; other backends keep ILIKE search
+    if op.get_bind().dialect.name != 'postgresql':
+        return
+
+    op.add_column('updates', sa.Column(
+        'search_vector',
+        postgresql.TSVECTOR(),
+        sa.Computed(
+            "to_tsvector('english', coalesce(name, '') || ' ' || "
+            "coalesce(message, '') || ' ' || coalesce(process, ''))",
+            persisted=True
+        ),
+        nullable=True
+    ))
+    op.create_index('ix_updates_fts', 'updates', ['search_vector'], unique=False, postgresql_using='gin')
+
+
+def downgrade():
+    if op.get_bind().dialect.name != 'postgresql':
+        return
+
+    op.drop_index('ix_updates_fts', table_name='updates', postgresql_using='gin')
+    op.drop_column('updates', 'search_vector')
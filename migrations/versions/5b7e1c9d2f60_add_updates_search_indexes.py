@@ -0,0 +1,43 @@
+"""Add trigram and timestamp indexes for update search
+
+Revision ID: 5b7e1c9d2f60
+Revises: 3f9c2d7e8a41
+Create Date: 2026-10-16 14:32:47.905114
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '5b7e1c9d2f60'
+down_revision = '3f9c2d7e8a41'
+branch_labels = None
+depends_on = None
+
+# Columns matched by the ILIKE '%term%' fallback search
+TRGM_COLUMNS = ('name', 'message', 'process')
+
+
+def upgrade():
+    # Newest-first listing and ORDER BY timestamp DESC LIMIT n
+    op.create_index('ix_updates_timestamp', 'updates', [sa.text('timestamp DESC')], unique=False)
+
+    # Trigram indexes let PostgreSQL answer '%term%' ILIKE filters from an index
+    if op.get_bind().dialect.name != 'postgresql':
+        return
+
+    op.execute('CREATE EXTENSION IF NOT EXISTS pg_trgm')
+    for column in TRGM_COLUMNS:
+        op.create_index(
+            f'ix_updates_{column}_trgm', 'updates', [column], unique=False,
+            postgresql_using='gin', postgresql_ops={column: 'gin_trgm_ops'}
+        )
+
+
+def downgrade():
+    if op.get_bind().dialect.name == 'postgresql':
+        for column in TRGM_COLUMNS:
+            op.drop_index(f'ix_updates_{column}_trgm', table_name='updates', postgresql_using='gin')
+
+    op.drop_index('ix_updates_timestamp', table_name='updates')
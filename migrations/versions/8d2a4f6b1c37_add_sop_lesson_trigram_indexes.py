@@ -0,0 +1,46 @@
+"""Add trigram indexes for SOP and lesson search
+
+Revision ID: 8d2a4f6b1c37
+Revises: 5b7e1c9d2f60
+Create Date: 2026-10-16 15:11:06.284519
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '8d2a4f6b1c37'
+down_revision = '5b7e1c9d2f60'
+branch_labels = None
+depends_on = None
+
+# Table -> columns matched by ILIKE '%term%' in search
+TRGM_COLUMNS = {
+    'sop_summaries': ('title', 'summary_text'),
+    'lessons_learned': ('title', 'content', 'summary'),
+}
+
+
+def upgrade():
+    # gin_trgm_ops serves both LIKE and ILIKE, so the search queries can
+    # keep using ILIKE (which SQLite also understands)
+    if op.get_bind().dialect.name != 'postgresql':
+        return
+
+    op.execute('CREATE EXTENSION IF NOT EXISTS pg_trgm')
+    for table, columns in TRGM_COLUMNS.items():
+        for column in columns:
+            op.create_index(
+                f'ix_{table}_{column}_trgm', table, [column], unique=False,
+                postgresql_using='gin', postgresql_ops={column: 'gin_trgm_ops'}
+            )
+
+
+def downgrade():
+    if op.get_bind().dialect.name != 'postgresql':
+        return
+
+    for table, columns in TRGM_COLUMNS.items():
+        for column in columns:
+            op.drop_index(f'ix_{table}_{column}_trgm', table_name=table, postgresql_using='gin')
@@ -0,0 +1,45 @@
+"""Add trigram indexes for the remaining /api/search columns
+
+Revision ID: a8e3f5c0d196
+Revises: f2b6d8e1a357
+Create Date: 2026-10-16 17:51:38.664021
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'a8e3f5c0d196'
+down_revision = 'f2b6d8e1a357'
+branch_labels = None
+depends_on = None
+
+# Table -> columns /api/search matches with ILIKE '%term%' that the earlier
+# trigram migrations don't cover
+TRGM_COLUMNS = {
+    'sop_summaries': ('department',),
+    'lessons_learned': ('author', 'department'),
+}
+
+
+def upgrade():
+    if op.get_bind().dialect.name != 'postgresql':
+        return
+
+    op.execute('CREATE EXTENSION IF NOT EXISTS pg_trgm')
+    for table, columns in TRGM_COLUMNS.items():
+        for column in columns:
+            op.create_index(
+                f'ix_{table}_{column}_trgm', table, [column], unique=False,
+                postgresql_using='gin', postgresql_ops={column: 'gin_trgm_ops'}
+            )
+
+
+def downgrade():
+    if op.get_bind().dialect.name != 'postgresql':
+        return
+
+    for table, columns in TRGM_COLUMNS.items():
+        for column in columns:
+            op.drop_index(f'ix_{table}_{column}_trgm', table_name=table, postgresql_using='gin')
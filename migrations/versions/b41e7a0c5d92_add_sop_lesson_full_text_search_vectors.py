@@ -0,0 +1,51 @@
+"""Add full-text search vectors to SOP summaries and lessons learned
+
+Revision ID: b41e7a0c5d92
+Revises: 8d2a4f6b1c37
+Create Date: 2026-10-16 15:38:52.117043
+
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision = 'b41e7a0c5d92'
+down_revision = '8d2a4f6b1c37'
+branch_labels = None
+depends_on = None
+
+# Table -> generated tsvector expression, mirroring the updates column
+SEARCH_VECTORS = {
+    'sop_summaries': (
+        "to_tsvector('english', coalesce(title, '') || ' ' || coalesce(summary_text, ''))"
+    ),
+    'lessons_learned': (
+        "to_tsvector('english', coalesce(title, '') || ' ' || "
+        "coalesce(summary, '') || ' ' || coalesce(content, ''))"
+    ),
+}
+
+
+def upgrade():
+    # Full-text search is PostgreSQL-only; other backends keep ILIKE search
+    if op.get_bind().dialect.name != 'postgresql':
+        return
+
+    for table, expression in SEARCH_VECTORS.items():
+        op.add_column(table, sa.Column(
+            'search_vector',
+            postgresql.TSVECTOR(),
+            sa.Computed(expression, persisted=True),
+            nullable=True
+        ))
+        op.create_index(f'ix_{table}_fts', table, ['search_vector'], unique=False, postgresql_using='gin')
+
+
+def downgrade():
+    if op.get_bind().dialect.name != 'postgresql':
+        return
+
+    for table in SEARCH_VECTORS:
+        op.drop_index(f'ix_{table}_fts', table_name=table, postgresql_using='gin')
+        op.drop_column(table, 'search_vector')
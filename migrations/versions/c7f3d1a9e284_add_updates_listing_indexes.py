@@ -0,0 +1,31 @@
+"""Add indexes for the updates listing filters, sorts and read counts
+
+Revision ID: c7f3d1a9e284
+Revises: b41e7a0c5d92
+Create Date: 2026-10-16 16:20:41.530872
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'c7f3d1a9e284'
+down_revision = 'b41e7a0c5d92'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # /updates?process=... newest first, and sort=process
+    op.create_index('ix_updates_process_ts', 'updates', ['process', sa.text('timestamp DESC')], unique=False)
+    # /updates?sort=author
+    op.create_index('ix_updates_name_ts', 'updates', ['name', sa.text('timestamp DESC')], unique=False)
+    # Per-update read counts (GROUP BY update_id ... WHERE update_id IN (...))
+    op.create_index('ix_read_logs_update_id', 'read_logs', ['update_id'], unique=False)
+
+
+def downgrade():
+    op.drop_index('ix_read_logs_update_id', table_name='read_logs')
+    op.drop_index('ix_updates_name_ts', table_name='updates')
+    op.drop_index('ix_updates_process_ts', table_name='updates')
@@ -0,0 +1,32 @@
+"""Add (created_at, id) listing indexes for SOPs and lessons
+
+Revision ID: d4c7b1e9f023
+Revises: a8e3f5c0d196
+Create Date: 2026-10-16 18:14:07.351892
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'd4c7b1e9f023'
+down_revision = 'a8e3f5c0d196'
+branch_labels = None
+depends_on = None
+
+LISTING_TABLES = ('sop_summaries', 'lessons_learned')
+
+
+def upgrade():
+    # Newest-first listing pages seek on (created_at, id) < (:after_ts, :after_id)
+    for table in LISTING_TABLES:
+        op.create_index(
+            f'ix_{table}_created_id', table,
+            [sa.text('created_at DESC'), sa.text('id DESC')], unique=False
+        )
+
+
+def downgrade():
+    for table in LISTING_TABLES:
+        op.drop_index(f'ix_{table}_created_id', table_name=table)
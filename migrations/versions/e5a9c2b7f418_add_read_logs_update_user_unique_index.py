@@ -0,0 +1,41 @@
+"""Add unique (update_id, user_id) index on read_logs
+
+Revision ID: e5a9c2b7f418
+Revises: c7f3d1a9e284
+Create Date: 2026-10-16 17:02:13.418260
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'e5a9c2b7f418'
+down_revision = 'c7f3d1a9e284'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # mark_read checks for an existing row before inserting, so duplicates
+    # can only come from concurrent requests; keep the earliest one
+    op.execute(
+        'DELETE FROM read_logs '
+        'WHERE user_id IS NOT NULL AND id NOT IN ('
+        'SELECT MIN(id) FROM read_logs WHERE user_id IS NOT NULL '
+        'GROUP BY update_id, user_id)'
+    )
+
+    # One read per signed-in user per update. Guest rows have a NULL user_id
+    # and stay unconstrained. update_id leads, so this index also serves the
+    # per-update read counts and replaces ix_read_logs_update_id
+    op.create_index('ix_read_logs_update_user', 'read_logs', ['update_id', 'user_id'], unique=True)
+    op.drop_index('ix_read_logs_update_id', table_name='read_logs')
+
+    if op.get_bind().dialect.name == 'postgresql':
+        op.execute('ANALYZE read_logs')
+
+
+def downgrade():
+    op.create_index('ix_read_logs_update_id', 'read_logs', ['update_id'], unique=False)
+    op.drop_index('ix_read_logs_update_user', table_name='read_logs')
@@ -0,0 +1,37 @@
+"""Add GIN indexes on SOP and lesson tags
+
+Revision ID: f2b6d8e1a357
+Revises: e5a9c2b7f418
+Create Date: 2026-10-16 17:24:51.092734
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'f2b6d8e1a357'
+down_revision = 'e5a9c2b7f418'
+branch_labels = None
+depends_on = None
+
+TAG_TABLES = ('sop_summaries', 'lessons_learned')
+
+
+def upgrade():
+    # tags is varchar[] on PostgreSQL; the default GIN array_ops answer
+    # tags @> ARRAY['x'] and tags && ARRAY[...] without a type change. The
+    # /api/search tag filter (tags.contains, see models.ArrayContains) is @>
+    if op.get_bind().dialect.name != 'postgresql':
+        return
+
+    for table in TAG_TABLES:
+        op.create_index(f'ix_{table}_tags_gin', table, ['tags'], unique=False, postgresql_using='gin')
+
+
+def downgrade():
+    if op.get_bind().dialect.name != 'postgresql':
+        return
+
+    for table in TAG_TABLES:
+        op.drop_index(f'ix_{table}_tags_gin', table_name=table, postgresql_using='gin')
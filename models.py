@@ -6,15 +6,56 @@ from extensions import db
 from flask_login import UserMixin
 from werkzeug.security import generate_password_hash, check_password_hash
 from sqlalchemy.dialects.postgresql import ARRAY
-from sqlalchemy import Text
+from sqlalchemy import Text, and_, type_coerce
+from sqlalchemy.ext.compiler import compiles
+from sqlalchemy.sql.expression import ColumnElement
+from sqlalchemy.sql.visitors import InternalTraversal
 import json
 from timezone_utils import UTC, IST, now_utc, to_ist, format_ist
 
+class ArrayContains(ColumnElement):
+    """``column`` holds every one of ``values``.
+
+    Compiles to ``column @> ARRAY[...]`` on PostgreSQL, so the GIN indexes on
+    tags apply, and to a match on the stored JSON text elsewhere.
+    """
+    inherit_cache = True
+    type = db.Boolean()
+    _is_implicitly_boolean = True
+    _traverse_internals = [
+        ("postgresql_clause", InternalTraversal.dp_clauseelement),
+        ("json_clause", InternalTraversal.dp_clauseelement),
+    ]
+
+    def __init__(self, column, values):
+        values = list(values)
+        self.postgresql_clause = type_coerce(column, ARRAY(db.String)).contains(values)
+        self.json_clause = and_(*[
+            type_coerce(column, Text).contains(json.dumps(value), autoescape=True)
+            for value in values
+        ])
+
+
+@compiles(ArrayContains)
+def _compile_array_contains(element, compiler, **kw):
+    return compiler.process(element.json_clause, **kw)
+
+
+@compiles(ArrayContains, "postgresql")
+def _compile_array_contains_postgresql(element, compiler, **kw):
+    return compiler.process(element.postgresql_clause, **kw)
+
+
 # Database-agnostic ARRAY type that works with PostgreSQL and SQLite
 class DatabaseAgnosticArray(db.TypeDecorator):
     impl = Text
     cache_ok = True
 
+    class comparator_factory(Text.Comparator):
+        def contains(self, other, **kwargs):
+            # Array containment rather than Text's substring LIKE
+            return ArrayContains(self.expr, other)
+
     def load_dialect_impl(self, dialect):
         if dialect.name == 'postgresql':
             from sqlalchemy.dialects.postgresql import ARRAY
@@ -48,6 +89,37 @@ class DatabaseAgnosticArray(db.TypeDecorator):
                 return []
 
 
+# Full-text search vector: TSVECTOR on PostgreSQL, plain Text elsewhere.
+# The column is generated by the database from the expression given to
+# search_vector_column (kept in step with the search_vector migrations), so
+# the ORM never writes it.
+class DatabaseAgnosticTSVector(db.TypeDecorator):
+    impl = Text
+    cache_ok = True
+
+    def load_dialect_impl(self, dialect):
+        if dialect.name == 'postgresql':
+            from sqlalchemy.dialects.postgresql import TSVECTOR
+            return dialect.type_descriptor(TSVECTOR())
+        return dialect.type_descriptor(Text)
+
+
+@compiles(db.Computed, "sqlite")
+def _sqlite_computed(computed, compiler, **kw):
+    # SQLite has no to_tsvector, so create_all() leaves a plain nullable
+    # column there, as the migrations do
+    return ""
+
+
+def search_vector_column(expression):
+    """Deferred full-text search column generated from ``expression``"""
+    return db.deferred(db.Column(
+        DatabaseAgnosticTSVector(),
+        db.Computed(expression, persisted=True),
+        nullable=True
+    ))
+
+
 class Update(db.Model):
     __tablename__ = "updates"
     id = db.Column(db.String(32), primary_key=True, default=lambda: uuid.uuid4().hex)  # auto-generate UUID
@@ -55,6 +127,13 @@ class Update(db.Model):
     message = db.Column(db.Text, nullable=False)
     process = db.Column(db.String(32), nullable=False)
     timestamp = db.Column(db.DateTime, nullable=False, default=now_utc)  # default timestamp
+    search_vector = search_vector_column(  # PostgreSQL full-text search (generated)
+        "to_tsvector('english', coalesce(name, '') || ' ' || "
+        "coalesce(message, '') || ' ' || coalesce(process, ''))"
+    )
+
+    # Don't fetch the generated search_vector back after every INSERT/UPDATE
+    __mapper_args__ = {"eager_defaults": False}
 
     # Read logs relationship removed - now using separate ReadLog model
 
@@ -81,6 +160,12 @@ class User(db.Model, UserMixin):
 
     # Read logs relationship removed - now using separate ReadLog and LessonReadLog models
 
+    # Audit/archive history can be large, so these stay unloaded query objects
+    activity_logs = db.relationship('ActivityLog', back_populates='user', lazy='dynamic')
+    archived_updates = db.relationship('ArchivedUpdate', back_populates='archived_by_user', lazy='dynamic')
+    archived_sops = db.relationship('ArchivedSOPSummary', back_populates='archived_by_user', lazy='dynamic')
+    archived_lessons = db.relationship('ArchivedLessonLearned', back_populates='archived_by_user', lazy='dynamic')
+
     def set_password(self, raw_password):
         self.password_hash = generate_password_hash(raw_password)
 
@@ -158,7 +243,7 @@ class ActivityLog(db.Model):
     details = db.Column(db.Text, nullable=True)  # Additional details about the action
 
     # Relationship to user
-    user = db.relationship('User', backref='activity_logs')
+    user = db.relationship('User', back_populates='activity_logs')
 
     def user_display(self):
         return self.user.display_name if self.user else "System"
@@ -176,7 +261,7 @@ class ArchivedUpdate(db.Model):
     archived_by = db.Column(db.Integer, db.ForeignKey('users.id'), nullable=True)
 
     # Relationship to user who archived it
-    archived_by_user = db.relationship('User', backref='archived_updates')
+    archived_by_user = db.relationship('User', back_populates='archived_updates')
 
 
 class ArchivedSOPSummary(db.Model):
@@ -192,7 +277,7 @@ class ArchivedSOPSummary(db.Model):
     archived_by = db.Column(db.Integer, db.ForeignKey('users.id'), nullable=True)
 
     # Relationship to user who archived it
-    archived_by_user = db.relationship('User', backref='archived_sops')
+    archived_by_user = db.relationship('User', back_populates='archived_sops')
 
 
 class ArchivedLessonLearned(db.Model):
@@ -210,7 +295,7 @@ class ArchivedLessonLearned(db.Model):
     archived_by = db.Column(db.Integer, db.ForeignKey('users.id'), nullable=True)
 
     # Relationship to user who archived it
-    archived_by_user = db.relationship('User', backref='archived_lessons')
+    archived_by_user = db.relationship('User', back_populates='archived_lessons')
 
 
 class SOPSummary(db.Model):
@@ -222,6 +307,12 @@ class SOPSummary(db.Model):
     department = db.Column(db.String(100), nullable=True)
     tags = db.Column(DatabaseAgnosticArray(), nullable=True)  # Database-agnostic array of tags
     created_at = db.Column(db.DateTime, nullable=False, default=now_utc)
+    search_vector = search_vector_column(  # PostgreSQL full-text search (generated)
+        "to_tsvector('english', coalesce(title, '') || ' ' || coalesce(summary_text, ''))"
+    )
+
+    # Don't fetch the generated search_vector back after every INSERT/UPDATE
+    __mapper_args__ = {"eager_defaults": False}
 
     def to_dict(self):
         return {
@@ -246,6 +337,13 @@ class LessonLearned(db.Model):
     tags = db.Column(DatabaseAgnosticArray(), nullable=True)  # Database-agnostic array of tags
     created_at = db.Column(db.DateTime, nullable=False, default=now_utc)
     updated_at = db.Column(db.DateTime, default=now_utc, onupdate=now_utc)
+    search_vector = search_vector_column(  # PostgreSQL full-text search (generated)
+        "to_tsvector('english', coalesce(title, '') || ' ' || "
+        "coalesce(summary, '') || ' ' || coalesce(content, ''))"
+    )
+
+    # Don't fetch the generated search_vector back after every INSERT/UPDATE
+    __mapper_args__ = {"eager_defaults": False}
 
     def to_dict(self):
         return {
@@ -5,10 +5,22 @@ from models import ReadLog, LessonReadLog
 from datetime import datetime
 import pytz
 from sqlalchemy import func
+from sqlalchemy.exc import IntegrityError
 from timezone_utils import now_utc
 
 bp = Blueprint('read_logs', __name__)
 
+# Unique index allowing one read per signed-in user per update
+READ_LOG_UNIQUE_INDEX = 'ix_read_logs_update_user'
+
+def is_duplicate_read(error):
+    """True if ``error`` is a violation of READ_LOG_UNIQUE_INDEX"""
+    orig = error.orig
+    if getattr(orig, 'pgcode', None) == '23505':  # unique_violation
+        return getattr(orig.diag, 'constraint_name', None) == READ_LOG_UNIQUE_INDEX
+    # SQLite names the indexed columns rather than the index
+    return 'UNIQUE constraint failed: read_logs.update_id, read_logs.user_id' in str(orig)
+
 @bp.route('/mark_read', methods=['POST'])
 def mark_read():
     data = request.get_json() or {}
@@ -66,7 +78,13 @@ def mark_read():
 
         log = ReadLogModel(**log_kwargs)
         db.session.add(log)
-        db.session.commit()
+        try:
+            db.session.commit()
+        except IntegrityError as e:
+            db.session.rollback()
+            if not is_duplicate_read(e):
+                raise
+            # A concurrent request recorded the same read first
 
         read_count = db.session.query(func.count(ReadLogModel.id)).filter_by(**{id_field: content_id}).scalar()
         return jsonify(status='success', read_count=read_count), 200
@@ -0,0 +1,92 @@
+"""Background runner for database restores"""
+
+import logging
+import queue
+import threading
+import uuid
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Callable, Dict, Optional
+
+from extensions import db
+from backup_system import DatabaseBackupSystem
+from timezone_utils import now_utc
+
+logger = logging.getLogger(__name__)
+
+MAX_TRACKED_JOBS = 50  # Finished jobs kept for status lookups
+
+
+class RestoreJobRunner:
+    """Runs backup restores on a worker thread and tracks their status.
+
+    Jobs run one at a time in submission order, so two restores never write
+    to the database concurrently. Job state is kept in memory and is only
+    visible to the process that accepted the job.
+    """
+
+    def __init__(self, app, max_tracked_jobs: int = MAX_TRACKED_JOBS):
+        self.app = app
+        self.max_tracked_jobs = max_tracked_jobs
+        self._queue = queue.Queue()
+        self._jobs: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._thread = None
+
+    def submit(self, backup_system: DatabaseBackupSystem, backup_path: Path, filename: str,
+               on_success: Optional[Callable[[], None]] = None) -> str:
+        """Queue a restore of ``backup_path`` and return its job id"""
+        job_id = uuid.uuid4().hex
+        with self._lock:
+            self._jobs[job_id] = {
+                'id': job_id,
+                'filename': filename,
+                'status': 'queued',
+                'submitted_at': now_utc(),
+                'started_at': None,
+                'finished_at': None,
+            }
+            self._prune()
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name="restore-runner", daemon=True)
+                self._thread.start()
+        self._queue.put((job_id, backup_system, backup_path, on_success))
+        return job_id
+
+    def get(self, job_id: str) -> Optional[Dict[str, Any]]:
+        """Return a snapshot of the job's state, or None if unknown"""
+        with self._lock:
+            job = self._jobs.get(job_id)
+            return dict(job) if job else None
+
+    def _prune(self):
+        # Drop the oldest finished jobs once over the limit; queued and
+        # running jobs are always kept
+        excess = len(self._jobs) - self.max_tracked_jobs
+        for job_id in [j['id'] for j in self._jobs.values() if j['finished_at']][:max(excess, 0)]:
+            del self._jobs[job_id]
+
+    def _update(self, job_id: str, **fields):
+        with self._lock:
+            self._jobs[job_id].update(fields)
+
+    def _run(self):
+        # One app context for the thread's lifetime rather than one per job
+        with self.app.app_context():
+            while True:
+                job_id, backup_system, backup_path, on_success = self._queue.get()
+                self._update(job_id, status='running', started_at=now_utc())
+                try:
+                    succeeded = backup_system.restore_backup(backup_path)
+                    if succeeded and on_success:
+                        on_success()
+                except Exception as e:
+                    logger.error(f"Restore job {job_id} failed: {e}")
+                    succeeded = False
+                finally:
+                    db.session.remove()
+                self._update(
+                    job_id,
+                    status='succeeded' if succeeded else 'failed',
+                    finished_at=now_utc()
+                )
@@ -4,14 +4,25 @@ Role-based access control decorators for LoopIn application
 """
 
 from functools import wraps
-from flask import flash, redirect, url_for, session, request
+from flask import flash, redirect, url_for, session, request, g
+from extensions import db
 from models import User
 
+def get_user_by_id(user_id):
+    """Load a user at most once per request; repeat lookups reuse flask.g."""
+    if not user_id:
+        return None
+    user_id = int(user_id)
+    cached = g.get("_user")
+    if cached is not None and cached[0] == user_id:
+        return cached[1]
+    user = db.session.get(User, user_id)
+    g._user = (user_id, user)
+    return user
+
 def get_current_user():
     """Get current user from session."""
-    if session.get("user_id"):
-        return User.query.get(session["user_id"])
-    return None
+    return get_user_by_id(session.get("user_id"))
 
 def admin_required(f):
     @wraps(f)
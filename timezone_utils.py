@@ -2,11 +2,14 @@
 Essential timezone utilities for LoopIn
 """
 import pytz
-from datetime import datetime, timezone
+from datetime import datetime, timedelta, timezone
 
 # Standard timezones
 UTC = pytz.UTC
-IST = pytz.timezone("Asia/Kolkata")
+# India has a fixed UTC+05:30 offset with no DST, so a fixed-offset tzinfo
+# gives the same results as the Olson zone without pytz's lookup/normalize
+IST_OFFSET = timedelta(hours=5, minutes=30)
+IST = timezone(IST_OFFSET, "IST")
 
 def now_utc():
     """Get current datetime in UTC"""
@@ -36,6 +39,9 @@ def format_ist(dt, format_str='%Y-%m-%d %H:%M'):
     """Format datetime in IST"""
     if dt is None:
         return 'N/A'
+    if dt.tzinfo is None and '%z' not in format_str and '%Z' not in format_str:
+        # Naive values are UTC; shifting by the fixed offset is enough
+        return (dt + IST_OFFSET).strftime(format_str)
     ist_dt = to_ist(dt)
     return ist_dt.strftime(format_str)
 
@@ -60,5 +66,4 @@ def is_within_hours(dt, hours=24, reference_time=None):
 
 def get_hours_ago(hours):
     """Get datetime that is specified hours ago"""
-    from datetime import timedelta
     return now_utc() - timedelta(hours=hours)
@@ -0,0 +1,212 @@
+"""Streaming Excel workbook writer used by the read log export
+
+Writes the SpreadsheetML parts directly instead of going through an Excel
+library: each worksheet's XML is streamed into a spooled temp file as rows
+are appended, and the parts are zipped into the .xlsx on close. No per-cell
+objects are kept in memory.
+"""
+
+import math
+import re
+import shutil
+import tempfile
+import zipfile
+from typing import Iterable, List, Optional
+from xml.sax.saxutils import escape, quoteattr
+
+# Excel's per-cell text limit
+MAX_CELL_LENGTH = 32767
+
+# Characters that are not allowed in XML 1.0 documents
+_ILLEGAL_XML_CHARS_RE = re.compile(r'[\x00-\x08\x0b\x0c\x0e-\x1f]')
+
+_SPOOL_MAX_SIZE = 1024 * 1024
+
+# Rows encoded and written to the spool per write in append_rows
+_ROW_BATCH_SIZE = 500
+
+_XML_HEADER = '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+_MAIN_NS = 'http://schemas.openxmlformats.org/spreadsheetml/2006/main'
+_REL_NS = 'http://schemas.openxmlformats.org/officeDocument/2006/relationships'
+
+_ROOT_RELS = (
+    _XML_HEADER +
+    '<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">'
+    '<Relationship Id="rId1" Type="' + _REL_NS + '/officeDocument" Target="xl/workbook.xml"/>'
+    '</Relationships>'
+)
+
+_STYLES = (
+    _XML_HEADER +
+    '<styleSheet xmlns="' + _MAIN_NS + '">'
+    '<fonts count="1"><font><sz val="11"/><name val="Calibri"/></font></fonts>'
+    '<fills count="2"><fill><patternFill patternType="none"/></fill>'
+    '<fill><patternFill patternType="gray125"/></fill></fills>'
+    '<borders count="1"><border><left/><right/><top/><bottom/><diagonal/></border></borders>'
+    '<cellStyleXfs count="1"><xf numFmtId="0" fontId="0" fillId="0" borderId="0"/></cellStyleXfs>'
+    '<cellXfs count="1"><xf numFmtId="0" fontId="0" fillId="0" borderId="0" xfId="0"/></cellXfs>'
+    '<cellStyles count="1"><cellStyle name="Normal" xfId="0" builtinId="0"/></cellStyles>'
+    '</styleSheet>'
+)
+
+
+def _column_letter(index: int) -> str:
+    """Convert a zero-based column index to its Excel letter (0 -> A)"""
+    letters = ''
+    index += 1
+    while index:
+        index, remainder = divmod(index - 1, 26)
+        letters = chr(65 + remainder) + letters
+    return letters
+
+
+_COLUMN_LETTERS = [_column_letter(i) for i in range(64)]
+
+
+def _format_cell(ref: str, value) -> str:
+    """Render one <c> element, or '' for empty cells"""
+    if value is None:
+        return ''
+    if isinstance(value, bool):
+        return f'<c r="{ref}" t="b"><v>{int(value)}</v></c>'
+    if isinstance(value, int) or (isinstance(value, float) and math.isfinite(value)):
+        return f'<c r="{ref}"><v>{value}</v></c>'
+    # Everything else, including NaN and infinities (which have no numeric
+    # cell form), is written as inline text
+    text = str(value)
+    if len(text) > MAX_CELL_LENGTH:
+        text = text[:MAX_CELL_LENGTH]
+    text = escape(_ILLEGAL_XML_CHARS_RE.sub('', text))
+    return f'<c r="{ref}" t="inlineStr"><is><t xml:space="preserve">{text}</t></is></c>'
+
+
+class StreamingSheet:
+    """Append-only worksheet whose XML is spooled to a temp file"""
+
+    def __init__(self, title: str, widths: Optional[List[float]] = None):
+        self.title = title
+        self._row = 0
+        self._buffer = tempfile.SpooledTemporaryFile(max_size=_SPOOL_MAX_SIZE)
+        head = [_XML_HEADER, f'<worksheet xmlns="{_MAIN_NS}" xmlns:r="{_REL_NS}">']
+        if widths:
+            head.append('<cols>')
+            for col, width in enumerate(widths, start=1):
+                head.append(f'<col min="{col}" max="{col}" width="{width}" customWidth="1"/>')
+            head.append('</cols>')
+        head.append('<sheetData>')
+        self._buffer.write(''.join(head).encode('utf-8'))
+
+    def _format_row(self, row: Iterable) -> str:
+        self._row += 1
+        r = self._row
+        cells = []
+        for col, value in enumerate(row):
+            letter = _COLUMN_LETTERS[col] if col < len(_COLUMN_LETTERS) else _column_letter(col)
+            cells.append(_format_cell(f'{letter}{r}', value))
+        return f'<row r="{r}">{"".join(cells)}</row>'
+
+    def append(self, row: Iterable):
+        self._buffer.write(self._format_row(row).encode('utf-8'))
+
+    def append_rows(self, rows: Iterable[Iterable]):
+        """Append every row from an iterable, writing _ROW_BATCH_SIZE rows at a time"""
+        batch = []
+        for row in rows:
+            batch.append(self._format_row(row))
+            if len(batch) >= _ROW_BATCH_SIZE:
+                self._buffer.write(''.join(batch).encode('utf-8'))
+                batch = []
+        if batch:
+            self._buffer.write(''.join(batch).encode('utf-8'))
+
+    def _finish(self, zf: zipfile.ZipFile, arcname: str):
+        self._buffer.write(b'</sheetData></worksheet>')
+        self._buffer.seek(0)
+        with zf.open(arcname, 'w', force_zip64=True) as member:
+            shutil.copyfileobj(self._buffer, member)
+
+
+class StreamingWorkbook:
+    """Write-once .xlsx workbook saved straight to ``path``.
+
+    Sheets may be appended to in any interleaving; rows within a sheet are
+    written in the order they are appended. Used as a context manager, the
+    workbook is written when the block exits normally and its spooled sheets
+    are discarded if the block raises.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self._sheets: List[StreamingSheet] = []
+
+    def add_sheet(self, title: str, widths: Optional[List[float]] = None) -> StreamingSheet:
+        """Add a worksheet, optionally with column widths"""
+        sheet = StreamingSheet(title[:31], widths)
+        self._sheets.append(sheet)
+        return sheet
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        if exc_type is None:
+            self.close()
+        else:
+            self._discard()
+
+    def _discard(self):
+        """Release every sheet's spooled temp file"""
+        for sheet in self._sheets:
+            sheet._buffer.close()
+
+    def close(self):
+        """Zip the workbook parts and write the .xlsx file"""
+        count = len(self._sheets)
+        sheet_overrides = ''.join(
+            f'<Override PartName="/xl/worksheets/sheet{i}.xml" '
+            'ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.worksheet+xml"/>'
+            for i in range(1, count + 1)
+        )
+        content_types = (
+            _XML_HEADER +
+            '<Types xmlns="http://schemas.openxmlformats.org/package/2006/content-types">'
+            '<Default Extension="rels" ContentType="application/vnd.openxmlformats-package.relationships+xml"/>'
+            '<Default Extension="xml" ContentType="application/xml"/>'
+            '<Override PartName="/xl/workbook.xml" '
+            'ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet.main+xml"/>'
+            '<Override PartName="/xl/styles.xml" '
+            'ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.styles+xml"/>'
+            + sheet_overrides +
+            '</Types>'
+        )
+        workbook = (
+            _XML_HEADER +
+            f'<workbook xmlns="{_MAIN_NS}" xmlns:r="{_REL_NS}"><sheets>' +
+            ''.join(
+                f'<sheet name={quoteattr(sheet.title)} sheetId="{i}" r:id="rId{i}"/>'
+                for i, sheet in enumerate(self._sheets, start=1)
+            ) +
+            '</sheets></workbook>'
+        )
+        workbook_rels = (
+            _XML_HEADER +
+            '<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">' +
+            ''.join(
+                f'<Relationship Id="rId{i}" Type="{_REL_NS}/worksheet" Target="worksheets/sheet{i}.xml"/>'
+                for i in range(1, count + 1)
+            ) +
+            f'<Relationship Id="rId{count + 1}" Type="{_REL_NS}/styles" Target="styles.xml"/>'
+            '</Relationships>'
+        )
+
+        try:
+            with zipfile.ZipFile(self.path, 'w', zipfile.ZIP_DEFLATED) as zf:
+                zf.writestr('[Content_Types].xml', content_types)
+                zf.writestr('_rels/.rels', _ROOT_RELS)
+                zf.writestr('xl/workbook.xml', workbook)
+                zf.writestr('xl/_rels/workbook.xml.rels', workbook_rels)
+                zf.writestr('xl/styles.xml', _STYLES)
+                for i, sheet in enumerate(self._sheets, start=1):
+                    sheet._finish(zf, f'xl/worksheets/sheet{i}.xml')
+        finally:
+            self._discard()